@@ -1,7 +1,80 @@
 from .vector2 import Vector2
 
 
+class _ReadOnlyVector2(Vector2):
+    """Vector2 whose coordinates can't be assigned."""
+
+    __slots__ = ("_x", "_y")
+
+    def __init__(self, x, y):
+        self._x = x
+        self._y = y
+
+    @property
+    def x(self):
+        return self._x
+
+    @property
+    def y(self):
+        return self._y
+
+
 class AABB:
+    """Axis aligned bounding box, stored as four floats.
+
+    min and max are read-only copies of the corners, built on every access: assigning them or
+    their coordinates raises AttributeError. Change the box through min_x, min_y, max_x and
+    max_y, or set.
+    """
+
+    __slots__ = ("min_x", "min_y", "max_x", "max_y")
+
     def __init__(self, min_x, min_y, max_x, max_y):
-        self.min = Vector2(min_x, min_y)
-        self.max = Vector2(max_x, max_y)
\ No newline at end of file
+        self.min_x = min_x
+        self.min_y = min_y
+        self.max_x = max_x
+        self.max_y = max_y
+
+    @property
+    def min(self):
+        return _ReadOnlyVector2(self.min_x, self.min_y)
+
+    @property
+    def max(self):
+        return _ReadOnlyVector2(self.max_x, self.max_y)
+
+    def set(self, min_x, min_y, max_x, max_y):
+        self.min_x = min_x
+        self.min_y = min_y
+        self.max_x = max_x
+        self.max_y = max_y
+        return self
+
+    def set_swept(self, min_x, min_y, max_x, max_y, dx, dy):
+        """Set the box, then stretch it along the displacement (dx, dy), e.g. velocity * dt."""
+        if dx < 0:
+            min_x += dx
+        else:
+            max_x += dx
+        if dy < 0:
+            min_y += dy
+        else:
+            max_y += dy
+        return self.set(min_x, min_y, max_x, max_y)
+
+    def union(self, other):
+        return AABB(min(self.min_x, other.min_x), min(self.min_y, other.min_y),
+                    max(self.max_x, other.max_x), max(self.max_y, other.max_y))
+
+    def contains(self, other):
+        return (self.min_x <= other.min_x and self.min_y <= other.min_y and
+                other.max_x <= self.max_x and other.max_y <= self.max_y)
+
+    def fattened(self, margin):
+        return AABB(self.min_x - margin, self.min_y - margin, self.max_x + margin, self.max_y + margin)
+
+    def perimeter(self):
+        return 2 * (self.max_x - self.min_x + self.max_y - self.min_y)
+
+    def __repr__(self):
+        return f"AABB({self.min_x}, {self.min_y}, {self.max_x}, {self.max_y})"
@@ -1,8 +1,9 @@
 from .AABB import AABB
+from .broad_phase import BroadPhase
 from .collision_manager import CollisionManager
 from .composite import Composite
 from .constraint import Constraint
-from .exceptions import NonPhysicalObjectError, ObjectNotInWorld
+from .exceptions import NonPhysicalObjectError, ObjectNotInWorld, SnapshotError
 from .particle import Particle
 from .rigid_body import RigidBody
 from .vector2 import Vector2
@@ -10,6 +11,7 @@ from .world import World
 
 __all__ = [
     "AABB",
+    "BroadPhase",
     "CollisionManager",
     "Composite",
     "Constraint",
@@ -17,6 +19,7 @@ __all__ = [
     "ObjectNotInWorld",
     "Particle",
     "RigidBody",
+    "SnapshotError",
     "Vector2",
     "World",
 ]
@@ -0,0 +1,276 @@
+from .AABB import AABB
+from .broad_phase import BroadPhase
+
+
+class _Node:
+    __slots__ = ("aabb", "body", "parent", "left", "right", "height")
+
+    def __init__(self, aabb, body=None):
+        self.aabb = aabb
+        self.body = body
+        self.parent = None
+        self.left = None
+        self.right = None
+        self.height = 0
+
+    def is_leaf(self):
+        return self.left is None
+
+
+class AABBTree:
+    """Incremental dynamic AABB tree (bounding volume hierarchy).
+
+    Leaves store a fattened copy of the body AABB so that small movements don't require
+    a reinsertion, and the tree is kept balanced with rotations on the way up after
+    every insertion and removal. The fat AABB can also be stretched along a predicted
+    displacement (dx, dy) so that fast bodies are reinserted less often.
+    """
+
+    def __init__(self, margin=4):
+        self.margin = margin
+        self.root = None
+        self._leaves = {}
+
+    def __len__(self):
+        return len(self._leaves)
+
+    def __contains__(self, body):
+        return body in self._leaves
+
+    @property
+    def height(self):
+        return self.root.height if self.root else 0
+
+    def _set_fat_AABB(self, fat, aabb, dx, dy):
+        margin = self.margin
+        return fat.set_swept(aabb.min_x - margin, aabb.min_y - margin,
+                             aabb.max_x + margin, aabb.max_y + margin, dx, dy)
+
+    def insert(self, body, aabb, dx=0, dy=0):
+        leaf = _Node(self._set_fat_AABB(AABB(0, 0, 0, 0), aabb, dx, dy), body)
+        self._leaves[body] = leaf
+        self._insert_leaf(leaf)
+
+    def remove(self, body):
+        leaf = self._leaves.pop(body)
+        self._remove_leaf(leaf)
+
+    def update(self, body, aabb, dx=0, dy=0):
+        """Move a body, returns True if it left its fat AABB and had to be reinserted."""
+        leaf = self._leaves[body]
+        if leaf.aabb.contains(aabb):
+            return False
+
+        self._remove_leaf(leaf)
+        self._set_fat_AABB(leaf.aabb, aabb, dx, dy)
+        self._insert_leaf(leaf)
+        return True
+
+    def query(self, aabb):
+        """Return the bodies whose fat AABB overlaps the given AABB."""
+        result = []
+        if self.root is None:
+            return result
+
+        min_x, min_y = aabb.min_x, aabb.min_y
+        max_x, max_y = aabb.max_x, aabb.max_y
+
+        # Same test as CollisionManager.intersect_AABB, inlined since this is the hot loop.
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            node_aabb = node.aabb
+            if (node_aabb.max_x <= min_x or max_x <= node_aabb.min_x or
+                    node_aabb.max_y <= min_y or max_y <= node_aabb.min_y):
+                continue
+            if node.left is None:
+                result.append(node.body)
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+
+        return result
+
+    def query_pairs(self):
+        """Return every pair of bodies whose fat AABBs overlap, each pair once."""
+        pairs = []
+        for body, leaf in self._leaves.items():
+            for other in self.query(leaf.aabb):
+                if other is not body and id(body) < id(other):
+                    pairs.append((body, other))
+        return pairs
+
+    def _insert_leaf(self, leaf):
+        if self.root is None:
+            self.root = leaf
+            leaf.parent = None
+            return
+
+        # Descend towards the sibling with the cheapest surface area heuristic cost.
+        leaf_aabb = leaf.aabb
+        node = self.root
+        while not node.is_leaf():
+            area = node.aabb.perimeter()
+            combined_area = node.aabb.union(leaf_aabb).perimeter()
+
+            cost = 2 * combined_area
+            inheritance_cost = 2 * (combined_area - area)
+
+            cost_left = self._descend_cost(node.left, leaf_aabb, inheritance_cost)
+            cost_right = self._descend_cost(node.right, leaf_aabb, inheritance_cost)
+
+            if cost < cost_left and cost < cost_right:
+                break
+
+            node = node.left if cost_left < cost_right else node.right
+
+        sibling = node
+        old_parent = sibling.parent
+        new_parent = _Node(sibling.aabb.union(leaf_aabb))
+        new_parent.parent = old_parent
+        new_parent.height = sibling.height + 1
+        new_parent.left = sibling
+        new_parent.right = leaf
+        sibling.parent = new_parent
+        leaf.parent = new_parent
+
+        if old_parent is None:
+            self.root = new_parent
+        elif old_parent.left is sibling:
+            old_parent.left = new_parent
+        else:
+            old_parent.right = new_parent
+
+        self._refit(leaf.parent)
+
+    @staticmethod
+    def _descend_cost(child, leaf_aabb, inheritance_cost):
+        union = child.aabb.union(leaf_aabb)
+        if child.is_leaf():
+            return union.perimeter() + inheritance_cost
+        return union.perimeter() - child.aabb.perimeter() + inheritance_cost
+
+    def _remove_leaf(self, leaf):
+        if leaf is self.root:
+            self.root = None
+            return
+
+        parent = leaf.parent
+        grand_parent = parent.parent
+        sibling = parent.right if parent.left is leaf else parent.left
+
+        if grand_parent is None:
+            self.root = sibling
+            sibling.parent = None
+        else:
+            if grand_parent.left is parent:
+                grand_parent.left = sibling
+            else:
+                grand_parent.right = sibling
+            sibling.parent = grand_parent
+            self._refit(grand_parent)
+
+        leaf.parent = None
+
+    def _refit(self, node):
+        while node is not None:
+            node = self._balance(node)
+            node.height = 1 + max(node.left.height, node.right.height)
+            node.aabb = node.left.aabb.union(node.right.aabb)
+            node = node.parent
+
+    def _balance(self, a):
+        """Rotate the subtree rooted at a if it is unbalanced, returns the new subtree root."""
+        if a.is_leaf() or a.height < 2:
+            return a
+
+        b = a.left
+        c = a.right
+        balance = c.height - b.height
+
+        if balance > 1:
+            return self._rotate(a, c, b)
+        if balance < -1:
+            return self._rotate(a, b, c)
+        return a
+
+    def _rotate(self, a, high, low):
+        """Promote the higher child of a, a becomes a child of it."""
+        f = high.left
+        g = high.right
+
+        high.left = a
+        high.parent = a.parent
+        a.parent = high
+
+        if high.parent is None:
+            self.root = high
+        elif high.parent.left is a:
+            high.parent.left = high
+        else:
+            high.parent.right = high
+
+        # The taller grandchild stays under high, the shorter one replaces high under a.
+        if f.height > g.height:
+            keep, give = f, g
+        else:
+            keep, give = g, f
+
+        high.right = keep
+        if a.left is high:
+            a.left = give
+        else:
+            a.right = give
+        give.parent = a
+
+        a.aabb = low.aabb.union(give.aabb)
+        high.aabb = a.aabb.union(keep.aabb)
+        a.height = 1 + max(low.height, give.height)
+        high.height = 1 + max(a.height, keep.height)
+
+        return high
+
+
+class AABBTreeBroadPhase(BroadPhase):
+    """Broad phase backed by an AABBTree, suited to worlds mixing huge and tiny bodies.
+
+    Fat AABBs are stretched by velocity * lookahead, lookahead being a duration in seconds.
+    """
+
+    def __init__(self, margin=4, lookahead=0):
+        self.tree = AABBTree(margin)
+        self.lookahead = lookahead
+
+    def _sync_bodies(self, bodies):
+        tree = self.tree
+        if len(tree) != len(bodies) or not all(body in tree for body in bodies):
+            current = set(bodies)
+            for body in [body for body in tree._leaves if body not in current]:
+                tree.remove(body)
+
+        lookahead = self.lookahead
+        for body in bodies:
+            dx = dy = 0
+            if lookahead:
+                velocity = body.velocity
+                dx = velocity.x * lookahead
+                dy = velocity.y * lookahead
+
+            if body in tree:
+                tree.update(body, body.AABB, dx, dy)
+            else:
+                tree.insert(body, body.AABB, dx, dy)
+
+    def get_pairs(self, bodies):
+        self._sync_bodies(bodies)
+
+        order = {body: index for index, body in enumerate(bodies)}
+
+        pairs = set()
+        for objA in bodies:
+            index = order[objA]
+            for objB in self.tree.query(objA.AABB):
+                if order[objB] > index and self._is_candidate(objA, objB):
+                    pairs.add((objA, objB))
+
+        return pairs
@@ -0,0 +1,157 @@
+import numpy as np
+
+
+class BatchCollisionManager:
+    """Vectorized counterparts of the CollisionManager tests, working on many pairs at once.
+
+    Every method returns a (collision, normal, depth) tuple of arrays with one row per pair,
+    matching what the scalar CollisionManager method returns for that pair.
+    """
+
+    @staticmethod
+    def intersect_circles(position, index_a, index_b, radius_a, radius_b):
+        """Test the circles index_a[i] and index_b[i] of a (n, 2) position array."""
+        center_a = position[index_a]
+        center_b = position[index_b]
+
+        delta = center_b - center_a
+        distance = np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1])
+        radii = radius_a + radius_b
+
+        collision = distance < radii
+        touching = collision & (distance != 0)
+
+        normal = np.zeros_like(delta)
+        np.divide(delta, distance[:, None], out=normal, where=touching[:, None])
+        depth = np.where(collision, radii - distance, 0.0)
+
+        return collision, normal, depth
+
+    @staticmethod
+    def pack_polygons(polygons):
+        """Pack lists of vertices into a padded (n, max_vertices, 2) array and a count array."""
+        counts = np.array([len(vertices) for vertices in polygons], dtype=np.intp)
+        packed = np.zeros((len(polygons), counts.max(initial=0), 2))
+        for row, vertices in enumerate(polygons):
+            packed[row, :len(vertices)] = [(v.x, v.y) for v in vertices]
+        return packed, counts
+
+    @staticmethod
+    def _normalize(x, y):
+        length = np.sqrt(x * x + y * y)
+        valid = length != 0
+        safe_length = np.where(valid, length, 1)
+        return np.where(valid, x / safe_length, 0.0), np.where(valid, y / safe_length, 0.0)
+
+    @staticmethod
+    def _edge_axes(vertices, counts):
+        """Normalized edge normals of padded polygons, with the mask of the real edges."""
+        max_vertices = vertices.shape[1]
+        current = np.arange(max_vertices)
+        valid = current[None, :] < counts[:, None]
+        following = np.where(current[None, :] + 1 < counts[:, None], current[None, :] + 1, 0)
+
+        start = vertices
+        end = np.take_along_axis(vertices, following[:, :, None], axis=1)
+        edge_x = end[:, :, 0] - start[:, :, 0]
+        edge_y = end[:, :, 1] - start[:, :, 1]
+        axis_x, axis_y = BatchCollisionManager._normalize(-edge_y, edge_x)
+        return axis_x, axis_y, valid
+
+    @staticmethod
+    def _packed_axes(vertices, counts, normals):
+        """Edge axes of padded polygons, taken from packed precomputed normals when given."""
+        if normals is None:
+            return BatchCollisionManager._edge_axes(vertices, counts)
+        valid = np.arange(normals.shape[1])[None, :] < counts[:, None]
+        return normals[:, :, 0], normals[:, :, 1], valid
+
+    @staticmethod
+    def _project_vertices(vertices, counts, axis_x, axis_y):
+        """Min and max projections of padded polygons (p, m, 2) on axes (p, k)."""
+        projection = (vertices[:, None, :, 0] * axis_x[:, :, None] +
+                      vertices[:, None, :, 1] * axis_y[:, :, None])
+        valid = (np.arange(vertices.shape[1])[None, :] < counts[:, None])[:, None, :]
+        return (np.where(valid, projection, np.inf).min(axis=2),
+                np.where(valid, projection, -np.inf).max(axis=2))
+
+    @staticmethod
+    def _project_circles(center, radius, axis_x, axis_y):
+        """Min and max projections of circles (p, 2) on axes (p, k)."""
+        direction_x, direction_y = BatchCollisionManager._normalize(axis_x, axis_y)
+        offset_x = direction_x * radius[:, None]
+        offset_y = direction_y * radius[:, None]
+        center_x = center[:, 0][:, None]
+        center_y = center[:, 1][:, None]
+        p1 = (center_x + offset_x) * axis_x + (center_y + offset_y) * axis_y
+        p2 = (center_x - offset_x) * axis_x + (center_y - offset_y) * axis_y
+        return np.minimum(p1, p2), np.maximum(p1, p2)
+
+    @staticmethod
+    def _resolve_axes(axis_x, axis_y, valid, min_a, max_a, min_b, max_b, direction):
+        """Shared end of the SAT tests: separation, minimum depth axis and normal orientation."""
+        separated = ((min_a >= max_b) | (min_b >= max_a)) & valid
+        collision = ~separated.any(axis=1)
+
+        axis_depth = np.where(valid, np.minimum(max_b - min_a, max_a - min_b), np.inf)
+        best = axis_depth.argmin(axis=1)[:, None]
+        depth = np.take_along_axis(axis_depth, best, axis=1)[:, 0]
+        normal = np.stack((np.take_along_axis(axis_x, best, axis=1)[:, 0],
+                           np.take_along_axis(axis_y, best, axis=1)[:, 0]), axis=1)
+
+        flip = direction[:, 0] * normal[:, 0] + direction[:, 1] * normal[:, 1] < 0
+        normal[flip] = -normal[flip]
+
+        normal[~collision] = 0
+        depth = np.where(collision, depth, 0.0)
+        return collision, normal, depth
+
+    @staticmethod
+    def intersect_polygons(vertices, counts, centers, index_a, index_b, normals=None):
+        """Test the packed polygons index_a[i] and index_b[i], centers and the optional packed
+        edge normals are aligned with vertices."""
+        vertices_a, counts_a = vertices[index_a], counts[index_a]
+        vertices_b, counts_b = vertices[index_b], counts[index_b]
+        normals_a = None if normals is None else normals[index_a]
+        normals_b = None if normals is None else normals[index_b]
+
+        axis_ax, axis_ay, valid_a = BatchCollisionManager._packed_axes(vertices_a, counts_a, normals_a)
+        axis_bx, axis_by, valid_b = BatchCollisionManager._packed_axes(vertices_b, counts_b, normals_b)
+        axis_x = np.concatenate((axis_ax, axis_bx), axis=1)
+        axis_y = np.concatenate((axis_ay, axis_by), axis=1)
+        valid = np.concatenate((valid_a, valid_b), axis=1)
+
+        min_a, max_a = BatchCollisionManager._project_vertices(vertices_a, counts_a, axis_x, axis_y)
+        min_b, max_b = BatchCollisionManager._project_vertices(vertices_b, counts_b, axis_x, axis_y)
+
+        direction = centers[index_b] - centers[index_a]
+        return BatchCollisionManager._resolve_axes(axis_x, axis_y, valid, min_a, max_a, min_b, max_b, direction)
+
+    @staticmethod
+    def intersect_circle_polygon(circle_center, circle_radius, vertices, counts, centers, polygon_index,
+                                 normals=None):
+        """Test circles (p, 2) of radius (p,) against the packed polygons polygon_index[i]."""
+        polygon_vertices, polygon_counts = vertices[polygon_index], counts[polygon_index]
+        polygon_normals = None if normals is None else normals[polygon_index]
+
+        edge_x, edge_y, edge_valid = BatchCollisionManager._packed_axes(polygon_vertices, polygon_counts,
+                                                                        polygon_normals)
+
+        # Last axis: from the circle center to the closest polygon vertex.
+        offset_x = polygon_vertices[:, :, 0] - circle_center[:, 0][:, None]
+        offset_y = polygon_vertices[:, :, 1] - circle_center[:, 1][:, None]
+        distance = np.sqrt(offset_x * offset_x + offset_y * offset_y)
+        distance[~edge_valid] = np.inf
+        closest = np.take_along_axis(polygon_vertices, distance.argmin(axis=1)[:, None, None], axis=1)[:, 0]
+        closest_x, closest_y = BatchCollisionManager._normalize(closest[:, 0] - circle_center[:, 0],
+                                                                closest[:, 1] - circle_center[:, 1])
+
+        axis_x = np.concatenate((edge_x, closest_x[:, None]), axis=1)
+        axis_y = np.concatenate((edge_y, closest_y[:, None]), axis=1)
+        valid = np.concatenate((edge_valid, np.ones((len(polygon_index), 1), dtype=bool)), axis=1)
+
+        min_a, max_a = BatchCollisionManager._project_vertices(polygon_vertices, polygon_counts, axis_x, axis_y)
+        min_b, max_b = BatchCollisionManager._project_circles(circle_center, circle_radius, axis_x, axis_y)
+
+        direction = centers[polygon_index] - circle_center
+        return BatchCollisionManager._resolve_axes(axis_x, axis_y, valid, min_a, max_a, min_b, max_b, direction)
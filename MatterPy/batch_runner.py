@@ -0,0 +1,181 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class BatchResult:
+    """Arrays filled by a BatchRunner, backed by shared memory blocks.
+
+    For run i and recorded frame f:
+    - counts[i, f] is the number of bodies of the world.
+    - positions[i, f, :counts[i, f]] and velocities[i, f, :counts[i, f]] are the rows of the
+      world storage, when the state is recorded. Rows past max_bodies aren't recorded.
+    - metrics[i, f, m] is the value of the m-th metric, in metric_names order.
+
+    The blocks are released by close, or when used as a context manager. Copy the arrays to
+    keep them afterwards.
+    """
+
+    def __init__(self, blocks, arrays, metric_names, frame_steps):
+        self._blocks = blocks
+        self.counts = arrays["counts"]
+        self.positions = arrays.get("positions")
+        self.velocities = arrays.get("velocities")
+        self.metrics = arrays.get("metrics")
+        self.metric_names = metric_names
+        self.frame_steps = frame_steps  # Number of steps run before each frame
+
+    @property
+    def body_counts(self):
+        """Number of bodies of every run before the first step."""
+        return self.counts[:, 0]
+
+    def metric(self, name):
+        """Return the (runs, frames) array of a metric."""
+        return self.metrics[:, :, self.metric_names.index(name)]
+
+    def close(self):
+        self.counts = self.positions = self.velocities = self.metrics = None
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _attach(layout):
+    blocks = []
+    arrays = {}
+    for name, (block_name, shape, dtype) in layout.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    return blocks, arrays
+
+
+def _record(world, arrays, run, frame, metrics):
+    storage = world.storage
+    arrays["counts"][run, frame] = storage.count
+    positions = arrays.get("positions")
+    if positions is not None:
+        count = min(storage.count, positions.shape[2])
+        positions[run, frame, :count] = storage.position[:count]
+        arrays["velocities"][run, frame, :count] = storage.velocity[:count]
+    if metrics:
+        values = arrays["metrics"]
+        for index, metric in enumerate(metrics):
+            values[run, frame, index] = metric(world)
+
+
+def _simulate(scene_factory, parameters, run, arrays, steps, record_every, metrics):
+    world = scene_factory(**parameters)
+    _record(world, arrays, run, 0, metrics)
+    frame = 1
+    done = 0
+    while done < steps:
+        advance = min(record_every, steps - done)
+        world.advance(advance)
+        done += advance
+        _record(world, arrays, run, frame, metrics)
+        frame += 1
+
+
+def _run_world(scene_factory, parameters, run, layout, steps, record_every, metrics):
+    """Simulate one world and write its frames to the shared arrays, in a worker process."""
+    blocks, arrays = _attach(layout)
+    try:
+        _simulate(scene_factory, parameters, run, arrays, steps, record_every, metrics)
+    finally:
+        arrays.clear()
+        for block in blocks:
+            try:
+                block.close()
+            except BufferError:
+                pass  # Still viewed from the traceback of an error, released with the worker
+
+
+class BatchRunner:
+    """Run independent worlds on a process pool and collect their state in shared memory.
+
+    scene_factory(**parameters) must build and return a World, for every parameter set given
+    to run. Every world is advanced by steps fixed substeps and recorded every record_every
+    steps, plus once before the first step. Workers write straight into shared NumPy arrays,
+    so worlds are never sent back to the parent process.
+
+    metrics maps names to functions of a world returning a float, e.g. the kinetic energy.
+    With record_state, the position and velocity of the first max_bodies rows of the storage
+    are recorded too. Without max_bodies, the scenes are built once in the parent process
+    and it is the largest body count of a scene before its first step: give it for scenes
+    adding bodies as they run.
+
+    scene_factory and metrics are sent to the workers, so they must be picklable, i.e.
+    defined at the top level of a module.
+    """
+
+    def __init__(self, scene_factory, steps, record_every=1, metrics=None, record_state=True, max_bodies=None):
+        if steps < 0 or record_every < 1:
+            raise ValueError("steps must be positive and record_every at least 1")
+        self.scene_factory = scene_factory
+        self.steps = steps
+        self.record_every = record_every
+        self.metrics = dict(metrics) if metrics else {}
+        self.record_state = record_state
+        self.max_bodies = max_bodies
+
+    @property
+    def frame_steps(self):
+        return list(range(0, self.steps, self.record_every)) + [self.steps]
+
+    def _max_bodies(self, parameter_sets):
+        if self.max_bodies is not None:
+            return self.max_bodies
+        return max((self.scene_factory(**parameters).storage.count for parameters in parameter_sets), default=0)
+
+    def run(self, parameter_sets, max_workers=None):
+        """Simulate a world per parameter set and return a BatchResult."""
+        parameter_sets = list(parameter_sets)
+        runs = len(parameter_sets)
+        frames = len(self.frame_steps)
+
+        shapes = {"counts": ((runs, frames), np.int64)}
+        if self.record_state:
+            shapes["positions"] = shapes["velocities"] = ((runs, frames, self._max_bodies(parameter_sets), 2),
+                                                         np.float64)
+        if self.metrics:
+            shapes["metrics"] = ((runs, frames, len(self.metrics)), np.float64)
+
+        blocks = []
+        arrays = {}
+        layout = {}
+        try:
+            for name, (shape, dtype) in shapes.items():
+                size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+                block = shared_memory.SharedMemory(create=True, size=size)
+                blocks.append(block)
+                array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+                array.fill(np.nan if dtype is np.float64 else 0)  # Rows past the body count of a run stay NaN
+                arrays[name] = array
+                layout[name] = (block.name, shape, dtype)
+
+            metric_functions = list(self.metrics.values())
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(_run_world, self.scene_factory, parameters, run, layout,
+                                           self.steps, self.record_every, metric_functions)
+                           for run, parameters in enumerate(parameter_sets)]
+                for future in futures:
+                    future.result()
+        except BaseException:
+            arrays.clear()
+            array = None  # Drop the last view on a block, so it can be closed
+            for block in blocks:
+                block.close()
+                block.unlink()
+            raise
+
+        return BatchResult(blocks, arrays, list(self.metrics), self.frame_steps)
@@ -0,0 +1,219 @@
+import numpy as np
+
+from .vector2 import Vector2
+
+
+class VectorView(Vector2):
+    """Vector2 reading and writing one row of a (n, 2) array of a BodyStorage.
+
+    row is a memoryview from BodyStorage.row, or a list while the body is outside a storage.
+    A body keeps the same views for its whole life and rebinds them when it moves to another
+    row, so a view kept by user code keeps following the body. With sleeping, the sleeping
+    slot of the body, writes wake the body like the property setters do.
+    """
+
+    __slots__ = ("_row", "_sleeping")
+
+    def __init__(self, row, sleeping=None):
+        self._row = row
+        self._sleeping = sleeping
+
+    def _bind(self, row, sleeping=None):
+        self._row = row
+        self._sleeping = sleeping
+
+    @property
+    def x(self):
+        return self._row[0]
+
+    @x.setter
+    def x(self, value):
+        self._row[0] = value
+        if self._sleeping is not None:
+            self._sleeping[0] = False
+
+    @property
+    def y(self):
+        return self._row[1]
+
+    @y.setter
+    def y(self, value):
+        self._row[1] = value
+        if self._sleeping is not None:
+            self._sleeping[0] = False
+
+    def set(self, x, y):
+        row = self._row
+        row[0] = x
+        row[1] = y
+        if self._sleeping is not None:
+            self._sleeping[0] = False
+        return self
+
+
+class BodyStorage:
+    """Struct of arrays holding the state of bodies in contiguous NumPy arrays.
+
+    Bodies are views on one slot of a storage: a body keeps its state in plain lists until it
+    is added to a World, which moves its state into the world storage, and gets it back when
+    it is removed. Slots are kept packed, removing a body moves the last one in its place.
+
+    Fields a body doesn't have are 0, e.g. the angle and materials of particles. shape holds the
+    radius of circles, the width and height of boxes, the number of points and size of regular
+    polygons.
+    """
+
+    VECTOR_FIELDS = ("position", "velocity", "force", "shape")
+    SCALAR_FIELDS = ("mass", "inv_mass", "angle", "angular_velocity", "sleep_time",
+                     "inertia", "friction", "restitution")
+    FIELDS = VECTOR_FIELDS + SCALAR_FIELDS + ("static", "sleeping")
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.bodies = []
+        self.version = 0  # Incremented every time slots are added, removed or moved
+
+        self.position = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.force = np.zeros((capacity, 2))
+        self.shape = np.zeros((capacity, 2))
+        self.mass = np.zeros(capacity)
+        self.inv_mass = np.zeros(capacity)
+        self.angle = np.zeros(capacity)
+        self.angular_velocity = np.zeros(capacity)
+        self.sleep_time = np.zeros(capacity)
+        self.inertia = np.zeros(capacity)
+        self.friction = np.zeros(capacity)
+        self.restitution = np.zeros(capacity)
+        self.static = np.zeros(capacity, dtype=bool)
+        self.sleeping = np.zeros(capacity, dtype=bool)
+        self._make_views()
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def capacity(self):
+        return len(self.mass)
+
+    def _grow(self, capacity):
+        for name in self.FIELDS:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self._make_views()
+
+        for index, body in enumerate(self.bodies):
+            body._bind(self, index)
+
+    def reserve(self, count):
+        """Make room for count bodies, so adding them doesn't move every body several times."""
+        if count > self.capacity:
+            self._grow(max(2 * self.capacity, count))
+
+    def _make_views(self):
+        # A memoryview reads and writes Python floats several times faster than indexing numpy,
+        # and slicing a flat memoryview is much faster than slicing the array.
+        self._views = {name: memoryview(getattr(self, name)).cast("B").cast(getattr(self, name).dtype.char)
+                       for name in self.FIELDS}
+
+    def slot(self, name, index):
+        """Return a one element memoryview on the slot index of a scalar field."""
+        return self._views[name][index:index + 1]
+
+    def row(self, name, index):
+        """Return a memoryview on the row index of a vector field."""
+        return self._views[name][2 * index:2 * index + 2]
+
+    def add(self, body):
+        """Move the state of a body into this storage and make the body a view on it."""
+        if body._storage is self:
+            return body._index
+
+        self.reserve(self.count + 1)
+
+        index = self.count
+        views = self._views
+        old_storage = body._storage
+        if old_storage is not None:
+            old_index = body._index
+            for name in self.FIELDS:
+                getattr(self, name)[index] = getattr(old_storage, name)[old_index]
+        else:
+            for name in self.VECTOR_FIELDS:
+                row = self._unbound_row(body, name)
+                views[name][2 * index] = row[0]
+                views[name][2 * index + 1] = row[1]
+            for name in self.FIELDS[len(self.VECTOR_FIELDS):]:
+                views[name][index] = getattr(body, "_" + name, (0,))[0]  # Particles have no angle
+
+        self.count += 1
+        self.bodies.append(body)
+        self.version += 1
+        body._bind(self, index)
+
+        if old_storage is not None:
+            old_storage._release(old_index)
+
+        return index
+
+    def extend(self, bodies):
+        """Add the bodies that aren't in a storage yet, all at once. It is much faster than adding
+        them one by one, other bodies are left untouched."""
+        bodies = [body for body in dict.fromkeys(bodies) if body._storage is None]
+        if not bodies:
+            return
+        start = self.count
+        stop = start + len(bodies)
+        self.reserve(stop)
+        for name in self.VECTOR_FIELDS:
+            getattr(self, name)[start:stop] = [self._unbound_row(body, name) for body in bodies]
+        for name in self.FIELDS[len(self.VECTOR_FIELDS):]:
+            getattr(self, name)[start:stop] = [getattr(body, "_" + name, (0,))[0] for body in bodies]
+
+        self.count = stop
+        self.bodies.extend(bodies)
+        self.version += 1
+        for index, body in enumerate(bodies, start):
+            body._bind(self, index)
+
+    def attach(self, bodies):
+        """Append new bodies without copying their state, the caller writes it in the storage
+        afterwards, e.g. World.restore."""
+        start = self.count
+        stop = start + len(bodies)
+        self.reserve(stop)
+        self.count = stop
+        self.bodies.extend(bodies)
+        self.version += 1
+        for index, body in enumerate(bodies, start):
+            body._bind(self, index)
+
+    @staticmethod
+    def _unbound_row(body, name):
+        """The row of a vector field of a body outside a storage, (0, 0) if it has no such field."""
+        value = getattr(body, "_" + name, (0.0, 0.0))
+        return value._row if isinstance(value, VectorView) else value
+
+    def remove(self, body):
+        """Remove a body from this storage, the body keeps its state in plain lists."""
+        if body._storage is not self:
+            return
+        index = body._index
+        body._unbind()
+        self._release(index)
+
+    def _release(self, index):
+        last = self.count - 1
+        if index != last:
+            for name in self.FIELDS:
+                array = getattr(self, name)
+                array[index] = array[last]
+            moved = self.bodies[last]
+            self.bodies[index] = moved
+            moved._bind(self, index)
+
+        self.bodies.pop()
+        self.count -= 1
+        self.version += 1
@@ -0,0 +1,33 @@
+from .collision_manager import CollisionManager
+
+
+class BroadPhase:
+    """Base class for the broad phase strategies a World can use to find candidate pairs."""
+
+    def get_pairs(self, bodies):
+        """Return the set of (objA, objB) pairs whose AABBs overlap, objA coming first in bodies."""
+        raise NotImplementedError("This method must be implemented in subclass")
+
+    @staticmethod
+    def _is_candidate(objA, objB):
+        if objA.static and objB.static:
+            return False  # Skip static vs static checks
+        return CollisionManager.intersect_AABB(objA.AABB, objB.AABB)
+
+
+class BruteForceBroadPhase(BroadPhase):
+    """Compare every body against every other one, O(n²)."""
+
+    def get_pairs(self, bodies):
+        pairs = set()
+        count = len(bodies)
+        for i in range(count - 1):
+            objA = bodies[i]
+
+            for j in range(i + 1, count):
+                objB = bodies[j]
+
+                if self._is_candidate(objA, objB):
+                    pairs.add((objA, objB))
+
+        return pairs
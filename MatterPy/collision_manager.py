@@ -1,6 +1,10 @@
+import math
+
 from .rigid_body import CircleRigidBody, PolygonRigidBody
 from .vector2 import Vector2
 
+CONTACT_EPSILON = 1e-3
+
 
 class CollisionManager:
 
@@ -13,18 +17,19 @@ class CollisionManager:
             if isinstance(body_b, PolygonRigidBody):
                 return CollisionManager.intersect_polygons(
                     body_a.position, body_a.vertices,
-                    body_b.position, body_b.vertices)
+                    body_b.position, body_b.vertices,
+                    body_a.normals, body_b.normals)
             elif isinstance(body_b, CircleRigidBody):
                 result, normal, depth = CollisionManager.intersect_circle_polygon(
                     body_b.position, body_b.radius,
-                    body_a.position, body_a.vertices)
+                    body_a.position, body_a.vertices, body_a.normals)
                 normal = -normal
                 return result, normal, depth
         elif isinstance(body_a, CircleRigidBody):
             if isinstance(body_b, PolygonRigidBody):
                 return CollisionManager.intersect_circle_polygon(
                     body_a.position, body_a.radius,
-                    body_b.position, body_b.vertices)
+                    body_b.position, body_b.vertices, body_b.normals)
             elif isinstance(body_b, CircleRigidBody):
                 return CollisionManager.intersect_circles(
                     body_a.position, body_a.radius,
@@ -33,18 +38,14 @@ class CollisionManager:
         return False, normal, depth
 
     @staticmethod
-    def intersect_circle_polygon(circle_center, circle_radius, polygon_center, vertices):
+    def intersect_circle_polygon(circle_center, circle_radius, polygon_center, vertices, normals=None):
         normal = Vector2(0, 0)
         depth = float('inf')
 
-        for i in range(len(vertices)):
-            va = vertices[i]
-            vb = vertices[(i + 1) % len(vertices)]
-
-            edge = vb - va
-            axis = Vector2(-edge.y, edge.x)
-            axis = Vector2.normalize(axis)
+        if normals is None:
+            normals = CollisionManager.get_edge_normals(vertices)
 
+        for axis in normals:
             min_a, max_a = CollisionManager.project_vertices(vertices, axis)
             min_b, max_b = CollisionManager.project_circle(circle_center, circle_radius, axis)
 
@@ -114,18 +115,16 @@ class CollisionManager:
         return min_proj, max_proj
 
     @staticmethod
-    def intersect_polygons(center_a, vertices_a, center_b, vertices_b):
+    def intersect_polygons(center_a, vertices_a, center_b, vertices_b, normals_a=None, normals_b=None):
         normal = Vector2(0, 0)
         depth = float('inf')
 
-        for i in range(len(vertices_a)):
-            va = vertices_a[i]
-            vb = vertices_a[(i + 1) % len(vertices_a)]
-
-            edge = vb - va
-            axis = Vector2(-edge.y, edge.x)
-            axis = Vector2.normalize(axis)
+        if normals_a is None:
+            normals_a = CollisionManager.get_edge_normals(vertices_a)
+        if normals_b is None:
+            normals_b = CollisionManager.get_edge_normals(vertices_b)
 
+        for axis in normals_a:
             min_a, max_a = CollisionManager.project_vertices(vertices_a, axis)
             min_b, max_b = CollisionManager.project_vertices(vertices_b, axis)
 
@@ -138,14 +137,7 @@ class CollisionManager:
                 depth = axis_depth
                 normal = axis
 
-        for i in range(len(vertices_b)):
-            va = vertices_b[i]
-            vb = vertices_b[(i + 1) % len(vertices_b)]
-
-            edge = vb - va
-            axis = Vector2(-edge.y, edge.x)
-            axis = Vector2.normalize(axis)
-
+        for axis in normals_b:
             min_a, max_a = CollisionManager.project_vertices(vertices_a, axis)
             min_b, max_b = CollisionManager.project_vertices(vertices_b, axis)
 
@@ -165,6 +157,17 @@ class CollisionManager:
 
         return True, normal, depth
 
+    @staticmethod
+    def get_edge_normals(vertices):
+        normals = []
+        for i in range(len(vertices)):
+            va = vertices[i]
+            vb = vertices[(i + 1) % len(vertices)]
+
+            edge = vb - va
+            normals.append(Vector2.normalize(Vector2(-edge.y, edge.x)))
+        return normals
+
     @staticmethod
     def project_vertices(vertices, axis):
         min_proj = float('inf')
@@ -197,7 +200,139 @@ class CollisionManager:
 
     @staticmethod
     def intersect_AABB(AABB_a, AABB_b):
-        if (AABB_a.max.x <= AABB_b.min.x or AABB_b.max.x <= AABB_a.min.x or
-                AABB_a.max.y <= AABB_b.min.y or AABB_b.max.y <= AABB_a.min.y):
+        if (AABB_a.max_x <= AABB_b.min_x or AABB_b.max_x <= AABB_a.min_x or
+                AABB_a.max_y <= AABB_b.min_y or AABB_b.max_y <= AABB_a.min_y):
             return False
-        return True
\ No newline at end of file
+        return True
+
+    @staticmethod
+    def find_contact_points(body_a, body_b, normal, tolerance):
+        """Return the 1 or 2 world space contact points of two colliding bodies, normal pointing
+        from body_a to body_b. Polygon points further than tolerance from touching are dropped,
+        see World.contact_tolerance."""
+        if isinstance(body_a, CircleRigidBody):
+            if isinstance(body_b, CircleRigidBody):
+                return [body_a.position + normal * body_a.radius]
+            return [CollisionManager.find_circle_polygon_contact_point(body_a.position, body_b.vertices)]
+        if isinstance(body_b, CircleRigidBody):
+            return [CollisionManager.find_circle_polygon_contact_point(body_b.position, body_a.vertices)]
+        return CollisionManager.find_polygons_contact_points(body_a.vertices, body_a.normals,
+                                                             body_b.vertices, body_b.normals,
+                                                             normal, tolerance)
+
+    @staticmethod
+    def point_segment_distance(point, a, b):
+        """Return the squared distance from point to the segment [a, b] and the closest point."""
+        ab_x = b.x - a.x
+        ab_y = b.y - a.y
+        ap_x = point.x - a.x
+        ap_y = point.y - a.y
+
+        length_squared = ab_x * ab_x + ab_y * ab_y
+        t = (ap_x * ab_x + ap_y * ab_y) / length_squared if length_squared else 0.0
+        if t <= 0:
+            closest_x, closest_y = a.x, a.y
+        elif t >= 1:
+            closest_x, closest_y = b.x, b.y
+        else:
+            closest_x, closest_y = a.x + ab_x * t, a.y + ab_y * t
+
+        dx = point.x - closest_x
+        dy = point.y - closest_y
+        return dx * dx + dy * dy, closest_x, closest_y
+
+    @staticmethod
+    def find_circle_polygon_contact_point(circle_center, vertices):
+        min_distance = float('inf')
+        contact_x = contact_y = 0.0
+
+        for i in range(len(vertices)):
+            distance, x, y = CollisionManager.point_segment_distance(
+                circle_center, vertices[i], vertices[(i + 1) % len(vertices)])
+            if distance < min_distance:
+                min_distance = distance
+                contact_x, contact_y = x, y
+
+        return Vector2(contact_x, contact_y)
+
+    @staticmethod
+    def find_most_aligned_edge(normals, x, y):
+        best_index = 0
+        best_alignment = float('-inf')
+        for i, normal in enumerate(normals):
+            alignment = normal.x * x + normal.y * y
+            if alignment > best_alignment:
+                best_index = i
+                best_alignment = alignment
+        return best_index, best_alignment
+
+    @staticmethod
+    def clip_segment(points, normal_x, normal_y, offset):
+        """Keep the part of a segment, given as a list of (x, y), where dot(point, normal) >= offset."""
+        if len(points) < 2:
+            return [point for point in points if point[0] * normal_x + point[1] * normal_y >= offset]
+
+        (x1, y1), (x2, y2) = points
+        distance_1 = x1 * normal_x + y1 * normal_y - offset
+        distance_2 = x2 * normal_x + y2 * normal_y - offset
+
+        clipped = []
+        if distance_1 >= 0:
+            clipped.append((x1, y1))
+        if distance_2 >= 0:
+            clipped.append((x2, y2))
+        if distance_1 * distance_2 < 0:
+            t = distance_1 / (distance_1 - distance_2)
+            clipped.append((x1 + (x2 - x1) * t, y1 + (y2 - y1) * t))
+        return clipped
+
+    @staticmethod
+    def find_polygons_contact_points(vertices_a, normals_a, vertices_b, normals_b, normal, tolerance):
+        """Clip the incident edge against the reference edge, the edge most aligned with the
+        collision normal, and keep the points within tolerance of touching it.
+
+        normals must be the outward edge normals, as PolygonRigidBody.normals."""
+        index_a, alignment_a = CollisionManager.find_most_aligned_edge(normals_a, normal.x, normal.y)
+        index_b, alignment_b = CollisionManager.find_most_aligned_edge(normals_b, -normal.x, -normal.y)
+
+        # The bias keeps the same reference edge from one step to the next on ties.
+        if alignment_b > alignment_a + CONTACT_EPSILON:
+            reference, reference_normal = vertices_b, normals_b[index_b]
+            reference_index, incident, incident_normals = index_b, vertices_a, normals_a
+        else:
+            reference, reference_normal = vertices_a, normals_a[index_a]
+            reference_index, incident, incident_normals = index_a, vertices_b, normals_b
+
+        v1 = reference[reference_index]
+        v2 = reference[(reference_index + 1) % len(reference)]
+        incident_index, _ = CollisionManager.find_most_aligned_edge(
+            incident_normals, -reference_normal.x, -reference_normal.y)
+        i1 = incident[incident_index]
+        i2 = incident[(incident_index + 1) % len(incident)]
+
+        # Side planes of the reference edge
+        tangent_x = v2.x - v1.x
+        tangent_y = v2.y - v1.y
+        length = math.sqrt(tangent_x * tangent_x + tangent_y * tangent_y)
+        tangent_x /= length
+        tangent_y /= length
+        points = [(i1.x, i1.y), (i2.x, i2.y)]
+        points = CollisionManager.clip_segment(points, tangent_x, tangent_y, v1.x * tangent_x + v1.y * tangent_y)
+        points = CollisionManager.clip_segment(points, -tangent_x, -tangent_y, -(v2.x * tangent_x + v2.y * tangent_y))
+
+        offset = v1.x * reference_normal.x + v1.y * reference_normal.y
+        contacts = []
+        deepest = None
+        deepest_separation = float('inf')
+        for x, y in points:
+            separation = x * reference_normal.x + y * reference_normal.y - offset
+            if separation <= tolerance:
+                contacts.append(Vector2(x, y))
+            if separation < deepest_separation:
+                deepest_separation = separation
+                deepest = Vector2(x, y)
+
+        if not contacts:
+            # Corner against corner, fall back on the vertex closest to the other polygon.
+            return [deepest] if deepest is not None else [Vector2((v1.x + v2.x) / 2, (v1.y + v2.y) / 2)]
+        return contacts
@@ -1,7 +1,12 @@
+from .vector2 import Vector2
+
+
 class Constraint:
     def __init__(self, objA, objB):
         self.objA = objA
         self.objB = objB
+        self.broken = False
+        self._delta_pos = Vector2(0, 0)  # Scratch vectors reused by every step
 
     def apply(self, dt):
         raise NotImplementedError("Cette méthode doit être implémentée dans la sous-classe.")
@@ -14,12 +19,14 @@ class SpringConstraint(Constraint):
         self.damping = damping
         self.max_force = max_force
         self.broken = False
+        self._delta_vel = Vector2(0, 0)
+        self._direction = Vector2(0, 0)
 
     def step(self, dt):
-        delta_pos = self.objB.position - self.objA.position
-        delta_vel = self.objB.velocity - self.objA.velocity
+        delta_pos = self.objB.position.sub_into(self.objA.position, self._delta_pos)
+        delta_vel = self.objB.velocity.sub_into(self.objA.velocity, self._delta_vel)
 
-        direction = delta_pos.normalize()
+        direction = delta_pos.normalize_into(self._direction)
 
         distance = delta_pos.length()
 
@@ -36,9 +43,8 @@ class SpringConstraint(Constraint):
         if total_force_magnitude > self.max_force and not self.max_force == 0:
             self.broken = True
 
-        force = direction * total_force_magnitude
-        self.objA.force += force
-        self.objB.force -= force
+        self.objA.force.add_scaled(direction, total_force_magnitude)
+        self.objB.force.add_scaled(direction, -total_force_magnitude)
 
 class BoneConstraint(Constraint):
     def __init__(self, objA, objB, length):
@@ -46,7 +52,7 @@ class BoneConstraint(Constraint):
         self.length = length
 
     def step(self, dt):
-        delta_pos = self.objB.position - self.objA.position
+        delta_pos = self.objB.position.sub_into(self.objA.position, self._delta_pos)
 
         distance = delta_pos.length()
 
@@ -54,7 +60,6 @@ class BoneConstraint(Constraint):
             return
 
         error = (distance - self.length) / distance
-        correction = delta_pos * error * 0.5
 
-        self.objA.position += correction
-        self.objB.position -= correction
\ No newline at end of file
+        self.objA.position.add_scaled(delta_pos, error * 0.5)
+        self.objB.position.add_scaled(delta_pos, -error * 0.5)
\ No newline at end of file
@@ -0,0 +1,135 @@
+import numpy as np
+
+
+class SpringBatch:
+    """All the SpringConstraints of a world solved at once.
+
+    Endpoints are stored as indices into the world BodyStorage, the spring parameters as
+    columns, and the forces are scatter-added into the storage force array. The parameters
+    are read when the batch is built, the World rebuilds it whenever constraints or bodies
+    are added or removed.
+    """
+
+    def __init__(self, springs, storage):
+        self.springs = list(springs)
+        self.version = storage.version  # The indices are only valid for this storage layout
+
+        self.index_a = np.array([spring.objA._index for spring in self.springs], dtype=np.intp)
+        self.index_b = np.array([spring.objB._index for spring in self.springs], dtype=np.intp)
+        self.length = np.array([spring.length for spring in self.springs], dtype=float)
+        self.stiffness = np.array([spring.stiffness for spring in self.springs], dtype=float)
+        self.damping = np.array([spring.damping for spring in self.springs], dtype=float)
+        self.max_force = np.array([spring.max_force for spring in self.springs], dtype=float)
+
+    def __len__(self):
+        return len(self.springs)
+
+    def step(self, storage, dt):
+        """Accumulate the spring forces, returns the mask of the springs that broke."""
+        if not self.springs:
+            return np.zeros(0, dtype=bool)
+
+        position = storage.position
+        velocity = storage.velocity
+        delta_pos = position[self.index_b] - position[self.index_a]
+        delta_vel = velocity[self.index_b] - velocity[self.index_a]
+
+        distance = np.sqrt(delta_pos[:, 0] * delta_pos[:, 0] + delta_pos[:, 1] * delta_pos[:, 1])
+        valid = distance != 0
+        safe_distance = np.where(valid, distance, 1)
+        direction = delta_pos / safe_distance[:, None]
+
+        spring_force_magnitude = (distance - self.length) * self.stiffness
+        dot_product = direction[:, 0] * delta_vel[:, 0] + direction[:, 1] * delta_vel[:, 1]
+        damping_force_magnitude = dot_product * self.damping
+
+        total_force_magnitude = np.where(valid, spring_force_magnitude + damping_force_magnitude, 0)
+        broken = (total_force_magnitude > self.max_force) & (self.max_force != 0)
+
+        force = direction * total_force_magnitude[:, None]
+        count = storage.count
+        for axis in (0, 1):
+            storage.force[:count, axis] += (np.bincount(self.index_a, weights=force[:, axis], minlength=count) -
+                                            np.bincount(self.index_b, weights=force[:, axis], minlength=count))
+
+        return broken
+
+    def compress(self, keep):
+        """Drop the springs where keep is False."""
+        self.springs = [spring for spring, kept in zip(self.springs, keep) if kept]
+        for name in ("index_a", "index_b", "length", "stiffness", "damping", "max_force"):
+            setattr(self, name, getattr(self, name)[keep])
+
+
+class BoneBatch:
+    """All the BoneConstraints of a world projected with a vectorized position based solver.
+
+    The constraint graph is greedily colored so that the bones of a color class never share a
+    body, every class can then be projected in one NumPy operation without write conflicts.
+    Static and sleeping bodies are not moved, the whole correction goes to the other end.
+    """
+
+    def __init__(self, bones, storage):
+        self.bones = list(bones)
+        self.version = storage.version
+
+        self.index_a = np.array([bone.objA._index for bone in self.bones], dtype=np.intp)
+        self.index_b = np.array([bone.objB._index for bone in self.bones], dtype=np.intp)
+        self.length = np.array([bone.length for bone in self.bones], dtype=float)
+        self.colors = self._color(self.index_a, self.index_b)
+        self.bodies = np.unique(np.concatenate((self.index_a, self.index_b)))
+
+    def __len__(self):
+        return len(self.bones)
+
+    @staticmethod
+    def _color(index_a, index_b):
+        """Return one index array of bones per color class."""
+        used_colors = {}
+        classes = []
+        for bone, (a, b) in enumerate(zip(index_a.tolist(), index_b.tolist())):
+            used = used_colors.setdefault(a, set()) | used_colors.setdefault(b, set())
+            color = 0
+            while color in used:
+                color += 1
+            used_colors[a].add(color)
+            used_colors[b].add(color)
+
+            if color == len(classes):
+                classes.append([])
+            classes[color].append(bone)
+
+        return [np.array(bones, dtype=np.intp) for bones in classes]
+
+    def solve(self, storage, dt, iterations=1):
+        """Project every bone iterations times, then turn the corrections into velocity so
+        the bodies don't keep drifting against the constraints."""
+        if not self.bones:
+            return
+
+        position = storage.position
+        inv_weight = (~(storage.static | storage.sleeping)).astype(float)
+        bodies = self.bodies
+        start_position = position[bodies]
+
+        for _ in range(iterations):
+            for bones in self.colors:
+                index_a = self.index_a[bones]
+                index_b = self.index_b[bones]
+
+                delta_pos = position[index_b] - position[index_a]
+                distance = np.sqrt(delta_pos[:, 0] * delta_pos[:, 0] + delta_pos[:, 1] * delta_pos[:, 1])
+
+                weight_a = inv_weight[index_a]
+                weight_b = inv_weight[index_b]
+                total_weight = weight_a + weight_b
+
+                valid = (distance != 0) & (total_weight != 0)
+                error = np.divide(distance - self.length[bones], distance * total_weight,
+                                  out=np.zeros_like(distance), where=valid)
+                correction = delta_pos * error[:, None]
+
+                position[index_a] += correction * weight_a[:, None]
+                position[index_b] -= correction * weight_b[:, None]
+
+        storage.velocity[bodies] += (position[bodies] - start_position) / dt
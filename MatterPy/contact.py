@@ -0,0 +1,61 @@
+from .vector2 import Vector2
+
+
+class Contact:
+    """A contact point, the impulses accumulated on it by the solver and the solver data that
+    only depends on the positions, computed once per step."""
+
+    __slots__ = ("point", "normal_impulse", "tangent_impulse",
+                 "r_a_x", "r_a_y", "r_b_x", "r_b_y", "normal_mass", "tangent_mass", "velocity_bias")
+
+    def __init__(self, point):
+        self.point = point
+        self.normal_impulse = 0.0
+        self.tangent_impulse = 0.0
+
+
+class ContactManifold:
+    """The contact points of a colliding pair.
+
+    Manifolds are kept by the World from one step to the next while the pair keeps
+    colliding, so the solver can start from the impulses found at the previous step.
+    """
+
+    def __init__(self, objA, objB):
+        self.objA = objA
+        self.objB = objB
+        self.normal = Vector2(0, 0)
+        self.depth = 0.0
+        self.contacts = []
+        self.friction = 0.0
+        # Set by the solver every step, static bodies have zero inverse mass and inertia
+        self.inv_mass_a = 0.0
+        self.inv_inertia_a = 0.0
+        self.inv_mass_b = 0.0
+        self.inv_inertia_b = 0.0
+        # Set by the World every step, the penetration left after separating the pair and the
+        # positions of objA and objB at that point
+        self.remaining_depth = 0.0
+        self.separated_positions = (0.0, 0.0, 0.0, 0.0)
+
+    def update(self, normal, depth, points, match_distance):
+        """Replace the contact points. A new point within match_distance of an old one inherits
+        its impulses, unless the normal turned too much for the old impulses to make sense."""
+        old_contacts = self.contacts if self.normal.dot(normal) > 0.95 else []
+        match_distance_squared = match_distance * match_distance
+
+        contacts = []
+        for point in points:
+            contact = Contact(point)
+            for old_contact in old_contacts:
+                dx = point.x - old_contact.point.x
+                dy = point.y - old_contact.point.y
+                if dx * dx + dy * dy <= match_distance_squared:
+                    contact.normal_impulse = old_contact.normal_impulse
+                    contact.tangent_impulse = old_contact.tangent_impulse
+                    break
+            contacts.append(contact)
+
+        self.normal = normal
+        self.depth = depth
+        self.contacts = contacts
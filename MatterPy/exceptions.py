@@ -4,4 +4,7 @@ class NonPhysicalObjectError(Exception):
 
 class ObjectNotInWorld(Exception):
     def __init__(self):
-        super(ObjectNotInWorld, self).__init__("This object is not in that world !")
\ No newline at end of file
+        super(ObjectNotInWorld, self).__init__("This object is not in that world !")
+
+class SnapshotError(Exception):
+    """Raised when a World snapshot can't be written or read."""
@@ -1,25 +1,66 @@
-from .vector2 import Vector2
+from .body_storage import VectorView
 
 class Particle:
     def __init__(self, x, y, mass=1, static=False):
-        self.mass = mass
-        self.inv_mass = 1 / mass if mass > 0 else float('inf')
-        self._position = Vector2(x, y)
-        self.velocity = Vector2(0, 0)
-        self.force = Vector2(0, 0)
-        self.static = static
+        # The state lives in plain lists until the particle is added to a World, see _bind
+        self._storage = None
+        self._index = -1
+        self._sleeping = [False]
+        self._sleep_time = [0.0]
+        self._position = VectorView([x, y], self._sleeping)
+        self._velocity = VectorView([0.0, 0.0], self._sleeping)
+        self._force = VectorView([0.0, 0.0])
+        self._mass = [mass]
+        self._inv_mass = [1 / mass if mass > 0 else float('inf')]
+        self._static = [static]
+
+    def _bind(self, storage, index):
+        """Make this particle a view on the slot index of storage."""
+        # Slices the views of the storage like BodyStorage.slot and row, it runs for every body
+        # added and every body moved
+        self._storage = storage
+        self._index = index
+        views = storage._views
+        stop = index + 1
+        self._sleeping = sleeping = views["sleeping"][index:stop]
+        self._sleep_time = views["sleep_time"][index:stop]
+        self._position._bind(views["position"][2 * index:2 * stop], sleeping)
+        self._velocity._bind(views["velocity"][2 * index:2 * stop], sleeping)
+        self._force._bind(views["force"][2 * index:2 * stop])
+        self._mass = views["mass"][index:stop]
+        self._inv_mass = views["inv_mass"][index:stop]
+        self._static = views["static"][index:stop]
+
+    def _unbind(self):
+        """Copy the state of this particle out of its storage, before it is removed from it."""
+        self._storage = None
+        self._index = -1
+        self._sleeping = [self._sleeping[0]]
+        self._sleep_time = [self._sleep_time[0]]
+        self._position._bind(list(self._position._row), self._sleeping)
+        self._velocity._bind(list(self._velocity._row), self._sleeping)
+        self._force._bind(list(self._force._row))
+        self._mass = [self._mass[0]]
+        self._inv_mass = [self._inv_mass[0]]
+        self._static = [self._static[0]]
 
     def step(self, dt: float):
+        # Writes the rows directly, writing through the views would wake the body
+        velocity = self._velocity._row
+        force = self._force._row
         if self.static:
-            self.velocity *= 0
-            self.force *= 0
+            velocity[0] = velocity[1] = 0
+            force[0] = force[1] = 0
             return
 
-        if self.mass > 0:
-            acceleration = self.force / self.mass
-            self.velocity += acceleration * dt
-        self._position += self.velocity * dt
-        self.force *= 0
+        mass = self.mass
+        if mass > 0:
+            velocity[0] = velocity[0] + force[0] / mass * dt
+            velocity[1] = velocity[1] + force[1] / mass * dt
+        position = self._position._row
+        position[0] += velocity[0] * dt
+        position[1] += velocity[1] * dt
+        force[0] = force[1] = 0
 
     @property
     def position(self):
@@ -35,12 +76,80 @@ class Particle:
 
     @position.setter
     def position(self, value):
-        self._position = value
+        self._sleeping[0] = False
+        if value is not self._position:  # In place operators already wrote into the view
+            self._position.set(value.x, value.y)
 
     @x.setter
     def x(self, value):
+        self._sleeping[0] = False
         self._position.x = value
 
     @y.setter
     def y(self, value):
-        self._position.y = value
\ No newline at end of file
+        self._sleeping[0] = False
+        self._position.y = value
+
+    @property
+    def velocity(self):
+        return self._velocity
+
+    @velocity.setter
+    def velocity(self, value):
+        self._sleeping[0] = False
+        if value is not self._velocity:
+            self._velocity.set(value.x, value.y)
+
+    @property
+    def force(self):
+        return self._force
+
+    @force.setter
+    def force(self, value):
+        if value is not self._force:
+            self._force.set(value.x, value.y)
+
+    @property
+    def mass(self):
+        return self._mass[0]
+
+    @mass.setter
+    def mass(self, value):
+        self._mass[0] = value
+
+    @property
+    def inv_mass(self):
+        return self._inv_mass[0]
+
+    @inv_mass.setter
+    def inv_mass(self, value):
+        self._inv_mass[0] = value
+
+    @property
+    def static(self):
+        return self._static[0]
+
+    @static.setter
+    def static(self, value):
+        self._static[0] = value
+
+    @property
+    def sleeping(self):
+        return self._sleeping[0]
+
+    @sleeping.setter
+    def sleeping(self, value):
+        self._sleeping[0] = value
+
+    @property
+    def sleep_time(self):
+        """Time the body has been moving slower than the sleep thresholds of its world."""
+        return self._sleep_time[0]
+
+    @sleep_time.setter
+    def sleep_time(self, value):
+        self._sleep_time[0] = value
+
+    def wake(self):
+        self._sleeping[0] = False
+        self._sleep_time[0] = 0
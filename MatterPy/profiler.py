@@ -0,0 +1,114 @@
+import json
+import threading
+import time
+
+
+class SubstepProfile:
+    """Timings in seconds and counters of one substep.
+
+    constraints runs inside step_objects, contact_solver and collision_handlers inside
+    narrow_phase: their time is also part of the enclosing phase.
+    """
+
+    __slots__ = ("index", "start", "times", "counters")
+
+    def __init__(self, index, start):
+        self.index = index
+        self.start = start
+        self.times = dict.fromkeys(Profiler.PHASES, 0.0)
+        self.counters = dict.fromkeys(Profiler.COUNTERS, 0)
+
+    @property
+    def duration(self):
+        return sum(self.times[phase] for phase in Profiler.PHASES if phase not in Profiler.NESTED_PHASES)
+
+    def __repr__(self):
+        return f"SubstepProfile(index={self.index}, times={self.times}, counters={self.counters})"
+
+
+class Profiler:
+    """Per phase timings and counters of the substeps of a World.
+
+    Enable it with world.profiler = Profiler(). After every substep, hook is called with its
+    SubstepProfile and the totals are updated. With trace, every phase is also kept as an
+    event, see chrome_trace.
+    """
+
+    PHASES = ("sleeping", "step_objects", "constraints", "broad_phase", "narrow_phase", "contact_solver",
+              "collision_handlers", "removals")
+    NESTED_PHASES = ("constraints", "contact_solver", "collision_handlers")
+    COUNTERS = ("bodies_integrated", "candidate_pairs", "contacts", "handler_calls", "broken_constraints")
+
+    def __init__(self, hook=None, trace=False):
+        self.hook = hook
+        self.trace = trace
+        self._lock = threading.Lock()  # Islands may be solved on other threads
+        self._origin = time.perf_counter()
+        self.reset()
+
+    def reset(self):
+        self.substeps = 0
+        self.times = dict.fromkeys(self.PHASES, 0.0)
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        self.last = None
+        self._current = None
+        self._events = []
+        self._threads = {}
+
+    def begin_substep(self):
+        self._current = SubstepProfile(self.substeps, time.perf_counter())
+
+    def phase(self, name, start, end):
+        """Add the time between the perf_counter values start and end to a phase. Phases run
+        outside of a substep, e.g. by calling World internals directly, are ignored."""
+        if self._current is None:
+            return
+        with self._lock:
+            self._current.times[name] += end - start
+            if self.trace:
+                thread = self._threads.setdefault(threading.get_ident(), len(self._threads))
+                self._events.append({"name": name, "cat": "MatterPy", "ph": "X", "pid": 0, "tid": thread,
+                                     "ts": (start - self._origin) * 1e6, "dur": (end - start) * 1e6})
+
+    def count(self, name, value=1):
+        if self._current is None:
+            return
+        with self._lock:
+            self._current.counters[name] += value
+
+    def end_substep(self):
+        profile = self._current
+        self._current = None
+        self.substeps += 1
+        for name, value in profile.times.items():
+            self.times[name] += value
+        for name, value in profile.counters.items():
+            self.counters[name] += value
+        if self.trace:
+            self._events.append({"name": "counters", "cat": "MatterPy", "ph": "C", "pid": 0,
+                                 "ts": (profile.start - self._origin) * 1e6, "args": dict(profile.counters)})
+        self.last = profile
+        if self.hook is not None:
+            self.hook(profile)
+
+    def mean_times(self):
+        """Return the mean time of every phase per substep."""
+        return {name: total / self.substeps if self.substeps else 0.0 for name, total in self.times.items()}
+
+    def summary(self):
+        lines = [f"{self.substeps} substeps", f"{'phase':>20} {'total s':>10} {'mean ms':>10}"]
+        for name, mean in self.mean_times().items():
+            lines.append(f"{name:>20} {self.times[name]:>10.3f} {mean * 1000:>10.3f}")
+        lines.append(f"{'counter':>20} {'total':>10} {'mean':>10}")
+        for name, total in self.counters.items():
+            lines.append(f"{name:>20} {total:>10} {total / max(self.substeps, 1):>10.1f}")
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        """Return the traced events in the Chrome trace event format, for chrome://tracing or
+        Perfetto."""
+        return {"traceEvents": list(self._events), "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path):
+        with open(path, "w") as file:
+            json.dump(self.chrome_trace(), file)
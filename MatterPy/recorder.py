@@ -0,0 +1,395 @@
+import json
+import weakref
+
+import numpy as np
+
+from .constraint import BoneConstraint
+from .particle import Particle
+from .snapshot import Snapshot
+from .world import World
+
+
+class TrajectoryRecorder:
+    """Stream the state of every body of a World to a memory-mapped file.
+
+    Attach it with world.recorder = TrajectoryRecorder(path, world): the initial state is
+    written when the recorder is created, then a frame is written every record_every
+    substeps. A frame holds the step and simulated time since the recorder was created,
+    the number of bodies, the index of its layout table, and for every storage row the
+    position, angle and velocity. A layout table holds for every row the id of its body (the
+    order it was added to the world in), its kind and shape, as in Snapshot, and static
+    flag, so bodies added or removed while recording are replayed right. A table is only
+    written when the rows change, or a static flag or shape.
+
+    File layout:
+    - a header, see HEADER;
+    - the endpoints of the constraints when recording started, as body ids, and the
+      metadata as JSON, in the Snapshot format;
+    - capacity frames of frame_dtype(max_bodies), aligned to a page.
+
+    The layout tables, of layout_dtype(max_bodies), are appended to path + ".layouts". They
+    are never overwritten, also with ring.
+
+    When the frames are full, the file grows by chunk_frames frames, or with ring the
+    oldest frames are overwritten. max_bodies is the body count of the world by default.
+    Recording a world with more bodies raises ValueError, unless clip is set: then the
+    rows past max_bodies aren't recorded.
+    """
+
+    MAGIC = b"MPTRAJ"
+    VERSION = 3
+    HEADER = np.dtype([("magic", "S8"), ("version", "<u4"), ("ring", "<u4"), ("max_bodies", "<u8"),
+                       ("capacity", "<u8"), ("frames", "<u8"), ("layout_size", "<u8"), ("frames_offset", "<u8"),
+                       ("layouts", "<u8")])
+    HEADER_SIZE = 64
+    PAGE_SIZE = 4096
+
+    def __init__(self, path, world, capacity=1024, max_bodies=None, ring=False, chunk_frames=None,
+                 record_every=1, metadata=None, clip=False):
+        if capacity < 1 or record_every < 1:
+            raise ValueError("capacity and record_every must be at least 1")
+        self.path = path
+        self.ring = ring
+        self.chunk_frames = chunk_frames or capacity
+        self.record_every = record_every
+        self.max_bodies = world.storage.count if max_bodies is None else max_bodies
+        self.clip = clip
+        self._step = 0
+        self._time = 0.0
+        self._body_layout = None  # Storage, version, layout table of the recorded rows and its index
+
+        layout = Snapshot.encode(self._get_layout(world, metadata))
+        frames_offset = -(-(self.HEADER_SIZE + len(layout)) // self.PAGE_SIZE) * self.PAGE_SIZE
+        header = np.zeros(1, dtype=self.HEADER)
+        header[0] = (self.MAGIC, self.VERSION, ring, self.max_bodies, capacity, 0, len(layout), frames_offset, 0)
+        with open(path, "wb") as file:
+            file.write(header.tobytes().ljust(self.HEADER_SIZE, b"\0"))
+            file.write(layout)
+            file.truncate(frames_offset + capacity * self.frame_dtype(self.max_bodies).itemsize)
+        open(self.layouts_path(path), "wb").close()
+
+        self._header = np.memmap(path, dtype=self.HEADER, mode="r+", shape=(1,))
+        self._frames_offset = frames_offset
+        self._map_frames(capacity)
+        self._write(world)
+
+    @staticmethod
+    def frame_dtype(max_bodies):
+        return np.dtype([("step", "<i8"), ("time", "<f8"), ("count", "<i8"), ("layout", "<i8"),
+                         ("position", "<f8", (max_bodies, 2)), ("angle", "<f8", (max_bodies,)),
+                         ("velocity", "<f8", (max_bodies, 2))])
+
+    @staticmethod
+    def layout_dtype(max_bodies):
+        return np.dtype([("count", "<i8"), ("id", "<i8", (max_bodies,)), ("kind", "u1", (max_bodies,)),
+                         ("shape", "<f8", (max_bodies, 2)), ("static", "?", (max_bodies,))])
+
+    @staticmethod
+    def layouts_path(path):
+        return f"{path}.layouts"
+
+    @staticmethod
+    def _get_layout(world, metadata):
+        endpoints = np.array([(world._order[constraint.objA], world._order[constraint.objB])
+                              for constraint in world.constraints
+                              if constraint.objA in world._order and constraint.objB in world._order],
+                             dtype=np.int64).reshape(-1, 2)
+        metadata = dict(metadata or {}, time_step=world.time_step, gravity=[world.gravity.x, world.gravity.y])
+        return {"constraint_endpoints": endpoints,
+                "metadata": np.frombuffer(json.dumps(metadata).encode(), dtype=np.uint8)}
+
+    def _get_layout_index(self, world, count):
+        """Return the index of the layout table of the first count rows, write a new table when
+        they changed. Ids and kinds are read again only when bodies are added or removed."""
+        storage = world.storage
+        layout = self._body_layout
+        if (layout is not None and layout[0] is storage and layout[1] == storage.version
+                and layout[2]["count"] == count
+                and np.array_equal(layout[2]["static"][:count], storage.static[:count])
+                and np.array_equal(layout[2]["shape"][:count], storage.shape[:count])):
+            return layout[3]
+
+        table = np.zeros((), dtype=self.layout_dtype(self.max_bodies))
+        if layout is not None and layout[0] is storage and layout[1] == storage.version:
+            table["id"] = layout[2]["id"]
+            table["kind"] = layout[2]["kind"]
+        else:
+            bodies = storage.bodies[:count]
+            table["id"][:count] = [world._order[body] for body in bodies]
+            table["kind"][:count] = Snapshot.get_kinds(bodies, strict=False)
+        table["count"] = count
+        table["shape"][:count] = storage.shape[:count]
+        table["static"][:count] = storage.static[:count]
+
+        with open(self.layouts_path(self.path), "ab") as file:
+            file.write(table.tobytes())
+        index = int(self._header["layouts"][0])
+        self._header["layouts"] = index + 1
+        self._body_layout = (storage, storage.version, table, index)
+        return index
+
+    def _map_frames(self, capacity):
+        self._frames = np.memmap(self.path, dtype=self.frame_dtype(self.max_bodies), mode="r+",
+                                 offset=self._frames_offset, shape=(capacity,))
+        self._steps = self._frames["step"]
+        self._times = self._frames["time"]
+        self._counts = self._frames["count"]
+        self._layouts = self._frames["layout"]
+        self._positions = self._frames["position"]
+        self._angles = self._frames["angle"]
+        self._velocities = self._frames["velocity"]
+        self.capacity = capacity
+
+    def _grow(self):
+        self._frames.flush()
+        self._frames = self._steps = self._times = self._counts = self._layouts = None
+        self._positions = self._angles = self._velocities = None
+        capacity = self.capacity + self.chunk_frames
+        with open(self.path, "r+b") as file:
+            file.truncate(self._frames_offset + capacity * self.frame_dtype(self.max_bodies).itemsize)
+        self._map_frames(capacity)
+        self._header["capacity"] = capacity
+
+    @property
+    def frames_written(self):
+        return int(self._header["frames"][0])
+
+    def record(self, world):
+        """Called by the world after every substep."""
+        self._step += 1
+        self._time += world.time_step
+        if self._step % self.record_every == 0:
+            self._write(world)
+
+    def _write(self, world):
+        storage = world.storage
+        count = storage.count
+        if count > self.max_bodies:
+            if not self.clip:
+                raise ValueError(f"The world has {count} bodies, more than max_bodies={self.max_bodies}: "
+                                 "give the recorder a larger max_bodies, or clip=True")
+            count = self.max_bodies
+        layout = self._get_layout_index(world, count)
+
+        written = self.frames_written
+        if written >= self.capacity:
+            if self.ring:
+                index = written % self.capacity
+            else:
+                self._grow()
+                index = written
+        else:
+            index = written
+
+        self._steps[index] = self._step
+        self._times[index] = self._time
+        self._counts[index] = count
+        self._layouts[index] = layout
+        self._positions[index, :count] = storage.position[:count]
+        self._angles[index, :count] = storage.angle[:count]
+        self._velocities[index, :count] = storage.velocity[:count]
+        self._header["frames"] = written + 1
+
+    def flush(self):
+        self._frames.flush()
+        self._header.flush()
+
+    def close(self):
+        if self._frames is None:
+            return
+        self.flush()
+        self._frames = self._header = None
+        self._steps = self._times = self._counts = self._layouts = None
+        self._positions = self._angles = self._velocities = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class TrajectoryFrame:
+    """Recorded state. For a single frame, the body arrays have count rows. For a range of
+    frames, every field gets a leading frame axis and the body arrays keep max_bodies rows,
+    rows past the count of a frame are meaningless. layout is the index of the layout table
+    id, kind, shape and static come from."""
+
+    __slots__ = ("step", "time", "count", "layout", "position", "angle", "velocity", "id", "kind", "shape",
+                 "static")
+
+    def __init__(self, step, time, count, layout, position, angle, velocity, id, kind, shape, static):
+        self.step = step
+        self.time = time
+        self.count = count
+        self.layout = layout
+        self.position = position
+        self.angle = angle
+        self.velocity = velocity
+        self.id = id
+        self.kind = kind
+        self.shape = shape
+        self.static = static
+
+
+class TrajectoryReader:
+    """Read a file written by TrajectoryRecorder without loading it.
+
+    The file is memory-mapped read only: reader[i] and reader[start:stop] return NumPy
+    views, only the pages actually read are loaded. The layout of a range of frames is
+    copied from the layout tables. Indices count from the oldest frame
+    still in the file, so in ring mode frame 0 is the oldest frame not overwritten yet, and
+    a range wrapping around the end of the ring is copied. A file still being recorded can
+    be read, new frames show up in len(reader).
+
+    create_world builds a World of display bodies and show copies a frame into it, so
+    anything drawing a World, e.g. the Renderer of the examples, can draw the recording.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        header = np.fromfile(path, dtype=TrajectoryRecorder.HEADER, count=1)
+        if len(header) == 0 or header["magic"][0] != TrajectoryRecorder.MAGIC:
+            raise ValueError(f"{path} is not a MatterPy trajectory")
+        if header["version"][0] != TrajectoryRecorder.VERSION:
+            raise ValueError(f"Unsupported trajectory version {header['version'][0]}")
+
+        self._header = np.memmap(path, dtype=TrajectoryRecorder.HEADER, mode="r", shape=(1,))
+        self.ring = bool(header["ring"][0])
+        self.max_bodies = int(header["max_bodies"][0])
+        self._frames_offset = int(header["frames_offset"][0])
+
+        layout_size = int(header["layout_size"][0])
+        with open(path, "rb") as file:
+            file.seek(TrajectoryRecorder.HEADER_SIZE)
+            layout = Snapshot.decode(file.read(layout_size))
+        self.constraint_endpoints = layout["constraint_endpoints"]
+        self.metadata = json.loads(bytes(layout["metadata"]))
+
+        self._frames = None
+        self._capacity = 0
+        self._layouts = None
+        self._shown = weakref.WeakKeyDictionary()  # World: index of the layout table of its bodies
+        self._map_frames()
+
+    def _map_frames(self):
+        capacity = int(self._header["capacity"][0])
+        if capacity != self._capacity:
+            self._frames = np.memmap(self.path, dtype=TrajectoryRecorder.frame_dtype(self.max_bodies), mode="r",
+                                     offset=self._frames_offset, shape=(capacity,))
+            self._capacity = capacity
+        return self._frames
+
+    def _map_layouts(self, index):
+        """Return the layout tables, mapped again when index is past the ones mapped."""
+        if self._layouts is None or index >= len(self._layouts):
+            self._layouts = np.memmap(TrajectoryRecorder.layouts_path(self.path), mode="r",
+                                      dtype=TrajectoryRecorder.layout_dtype(self.max_bodies),
+                                      shape=(int(self._header["layouts"][0]),))
+        return self._layouts
+
+    @property
+    def time_step(self):
+        return self.metadata["time_step"]
+
+    @property
+    def frames_written(self):
+        return int(self._header["frames"][0])
+
+    def __len__(self):
+        return min(self.frames_written, int(self._header["capacity"][0]))
+
+    def _oldest(self):
+        return self.frames_written - len(self)
+
+    def __getitem__(self, key):
+        frames = self._map_frames()
+        length = len(self)
+        if isinstance(key, slice):
+            selected = frames[self._selection(*key.indices(length))]
+            indices = selected["layout"]
+            tables = self._map_layouts(int(indices.max(initial=0)))[indices]
+            return TrajectoryFrame(selected["step"], selected["time"], selected["count"], indices,
+                                   selected["position"], selected["angle"], selected["velocity"],
+                                   tables["id"], tables["kind"], tables["shape"], tables["static"])
+
+        if key < 0:
+            key += length
+        if not 0 <= key < length:
+            raise IndexError("Frame index out of range")
+        index = (self._oldest() + key) % self._capacity
+        count = int(frames["count"][index])
+        layout = int(frames["layout"][index])
+        table = self._map_layouts(layout)[layout]
+        return TrajectoryFrame(int(frames["step"][index]), float(frames["time"][index]), count, layout,
+                               *(frames[name][index, :count] for name in ("position", "angle", "velocity")),
+                               *(table[name][:count] for name in ("id", "kind", "shape", "static")))
+
+    def _selection(self, start, stop, step):
+        """Index of the frames of a range in the file: a slice, so a view, unless the range wraps
+        around the end of the ring."""
+        indices = range(start + self._oldest(), stop + self._oldest(), step)
+        if not indices:
+            return slice(0, 0)
+        first = indices[0] % self._capacity
+        last = indices[-1] % self._capacity
+        if step > 0 and first <= last:
+            return slice(first, last + 1, step)
+        if step < 0 and first >= last:
+            return slice(first, last - 1 if last > 0 else None, step)
+        return [index % self._capacity for index in indices]
+
+    def index_at(self, time):
+        """Return the index of the last frame recorded at or before time."""
+        times = self._map_frames()["time"][self._selection(0, len(self), 1)]
+        return max(int(np.searchsorted(times, time, side="right")) - 1, 0)
+
+    def create_world(self):
+        """Return a World showing the first frame, see show. The world is only meant to be
+        drawn."""
+        world = World()
+        if len(self):
+            self.show(0, world)
+        return world
+
+    def show(self, index, world):
+        """Move the bodies of a world made by create_world to a frame.
+
+        When the layout table of the frame differs from the one shown, the bodies of the world
+        are replaced, with a BoneConstraint for every recorded constraint whose bodies are both
+        in the frame."""
+        frame = self[index]
+        if self._shown.get(world) != frame.layout:
+            self._set_bodies(world, frame)
+            self._shown[world] = frame.layout
+
+        storage = world.storage
+        count = frame.count
+        storage.position[:count] = frame.position
+        storage.angle[:count] = frame.angle
+        storage.velocity[:count] = frame.velocity
+        for body in world.rigid_bodies:
+            body.update_geometry()
+        return frame
+
+    def _set_bodies(self, world, frame):
+        world.remove(*world.constraints, *world.storage.bodies)
+        bodies = {}
+        for body_id, kind, shape, static in zip(frame.id.tolist(), frame.kind.tolist(), frame.shape,
+                                                frame.static.tolist()):
+            body = Particle(0, 0) if kind == Snapshot.UNKNOWN else Snapshot.create_body(kind, shape)
+            body.static = static
+            bodies[body_id] = body
+        world.add(*bodies.values())
+        world.add(*(BoneConstraint(bodies[a], bodies[b], 0) for a, b in self.constraint_endpoints.tolist()
+                    if a in bodies and b in bodies))
+
+    def close(self):
+        self._frames = self._header = self._layouts = None
+        self._capacity = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -6,67 +6,202 @@ from .vector2 import Vector2
 
 
 class RigidBody(Particle):
+    # Shape parameters, see BodyStorage. Subclasses set them before RigidBody.__init__, as
+    # calculate_inertia needs them.
+    _shape = (0.0, 0.0)
+
     def __init__(self, x, y, mass=1, angle=0, friction=0, restitution=1, static=False):
         super().__init__(x, y, mass, static)
 
+        self._angle = [0.0]
+        self._angular_velocity = [0.0]
         self.angular_velocity = 0
         self.angle = angle
 
-        self.inertia = self.calculate_inertia()
-        self.friction = friction
-        self.restitution = restitution
+        self._inertia = [self.calculate_inertia()]
+        self._friction = [friction]
+        self._restitution = [restitution]
 
         self.AABB = None
 
+    def _bind(self, storage, index):
+        super()._bind(storage, index)
+        views = storage._views
+        stop = index + 1
+        self._angle = views["angle"][index:stop]
+        self._angular_velocity = views["angular_velocity"][index:stop]
+        self._inertia = views["inertia"][index:stop]
+        self._friction = views["friction"][index:stop]
+        self._restitution = views["restitution"][index:stop]
+        self._shape = views["shape"][2 * index:2 * stop]
+
+    def _unbind(self):
+        super()._unbind()
+        self._angle = [self._angle[0]]
+        self._angular_velocity = [self._angular_velocity[0]]
+        self._inertia = [self._inertia[0]]
+        self._friction = [self._friction[0]]
+        self._restitution = [self._restitution[0]]
+        self._shape = list(self._shape)
+
+    @property
+    def inertia(self):
+        return self._inertia[0]
+
+    @inertia.setter
+    def inertia(self, value):
+        self._inertia[0] = value
+
+    @property
+    def friction(self):
+        return self._friction[0]
+
+    @friction.setter
+    def friction(self, value):
+        self._friction[0] = value
+
+    @property
+    def restitution(self):
+        return self._restitution[0]
+
+    @restitution.setter
+    def restitution(self, value):
+        self._restitution[0] = value
+
+    @property
+    def angle(self):
+        return self._angle[0]
+
+    @angle.setter
+    def angle(self, value):
+        self._sleeping[0] = False
+        self._angle[0] = value
+
+    @property
+    def angular_velocity(self):
+        return self._angular_velocity[0]
+
+    @angular_velocity.setter
+    def angular_velocity(self, value):
+        self._sleeping[0] = False
+        self._angular_velocity[0] = value
+
     def calculate_inertia(self):
         raise NotImplementedError("This method must be implemented in subclass")
 
     def get_AABB(self):
         raise NotImplementedError("This method must be implemented in subclass")
 
+    def _set_AABB(self, min_x, min_y, max_x, max_y):
+        """Update the AABB in place, it is only allocated the first time."""
+        if self.AABB is None:
+            self.AABB = AABB(min_x, min_y, max_x, max_y)
+        else:
+            self.AABB.set(min_x, min_y, max_x, max_y)
+        return self.AABB
+
+    def update_geometry(self):
+        """Bring the world space shape and AABB up to date with position and angle."""
+        self.get_AABB()
+
     def step(self, dt: float):
         super().step(dt)
-        self.AABB = self.get_AABB()
-        self.angle += self.angular_velocity * dt
+        self._angle[0] += self.angular_velocity * dt
+        self.update_geometry()
 
 
 class CircleRigidBody(RigidBody):
     def __init__(self, x, y, radius, mass=1, angle=0, friction=0, restitution=1, static=False):
-        self.radius = radius
+        self._shape = [radius, 0.0]
         super().__init__(x, y, mass, angle, friction, restitution, static)
 
+    @property
+    def radius(self):
+        return self._shape[0]
+
+    @radius.setter
+    def radius(self, value):
+        self._shape[0] = value
+
     def calculate_inertia(self):
         return 0.5 * self.mass * self.radius ** 2
 
     def get_AABB(self):
+        x, y = self.x, self.y
+        radius = self.radius
+        return self._set_AABB(x - radius, y - radius, x + radius, y + radius)
 
-        min_x = self.position.x - self.radius
-        min_y = self.position.y - self.radius
-        max_x = self.position.x + self.radius
-        max_y = self.position.y + self.radius
-
-        self.AABB = AABB(min_x, min_y, max_x, max_y)
 
-        return self.AABB
+class PolygonRigidBody(RigidBody):
+    """Polygon given by its vertices around (0, 0).
 
+    The local edge normals are computed once. World space vertices and normals are computed
+    lazily, when something reads them, and cached until the position or angle change: the
+    rotated shape is keyed on the angle and the world vertices on (x, y, angle).
+    """
 
-class PolygonRigidBody(RigidBody):
     def __init__(self, x, y, vertices, mass=1, angle=0, friction=0, restitution=1, static=False):
         super().__init__(x, y, mass, angle, friction, restitution, static)
         self._default_vertices = vertices
-        self.vertices = self._default_vertices
+        self._local_normals = self._get_local_normals(vertices)
 
-    def _get_transformed_vertices(self):
-        sin = math.sin(self.angle)
-        cos = math.cos(self.angle)
+        self._rotation_angle = None
+        self._rotated_vertices = None
+        self._rotated_bounds = None
+        self._normals = None
+        self._vertices_key = None
+        self._vertices = None
 
-        self.transformed_vertices = [self.transform(vector, self.x, self.y, sin, cos) for vector in self._default_vertices]
-
-        return self.transformed_vertices
+    @staticmethod
+    def _get_local_normals(vertices):
+        """Outward unit normals of the edges, whatever the winding of the vertices."""
+        normals = []
+        for i in range(len(vertices)):
+            va = vertices[i]
+            vb = vertices[(i + 1) % len(vertices)]
+            edge = vb - va
+            normal = Vector2(-edge.y, edge.x).normalize()
+            if normal.dot(va + vb) < 0:  # The polygon contains (0, 0)
+                normal = -normal
+            normals.append(normal)
+        return normals
+
+    def _update_rotation(self, angle):
+        sin = math.sin(angle)
+        cos = math.cos(angle)
+
+        self._rotated_vertices = [self.transform(vector, 0, 0, sin, cos) for vector in self._default_vertices]
+        self._normals = [self.transform(normal, 0, 0, sin, cos) for normal in self._local_normals]
+
+        xs = [v.x for v in self._rotated_vertices]
+        ys = [v.y for v in self._rotated_vertices]
+        self._rotated_bounds = (min(xs), min(ys), max(xs), max(ys))
+        self._rotation_angle = angle
+
+    @property
+    def vertices(self):
+        x, y, angle = self.x, self.y, self.angle
+        if self._vertices_key != (x, y, angle):
+            if angle != self._rotation_angle:
+                self._update_rotation(angle)
+            self._vertices = [Vector2(v.x + x, v.y + y) for v in self._rotated_vertices]
+            self._vertices_key = (x, y, angle)
+        return self._vertices
+
+    @property
+    def transformed_vertices(self):
+        return self.vertices
+
+    @property
+    def normals(self):
+        """World space edge normals, normals[i] belongs to the edge vertices[i] -> vertices[i + 1]."""
+        angle = self.angle
+        if angle != self._rotation_angle:
+            self._update_rotation(angle)
+        return self._normals
 
-    def step(self, dt: float):
-        super().step(dt)
-        self.vertices = self._get_transformed_vertices()
+    def _get_transformed_vertices(self):
+        return self.vertices
 
     @staticmethod
     def transform(vector, center_x, center_y, sin, cos):
@@ -75,24 +210,18 @@ class PolygonRigidBody(RigidBody):
         return Vector2(x, y)
 
     def get_AABB(self):
-        min_x, min_y = float('inf'), float('inf')
-        max_x, max_y = float('-inf'), float('-inf')
-
-        for v in self.vertices:
-            min_x = min(min_x, v.x)
-            min_y = min(min_y, v.y)
-            max_x = max(max_x, v.x)
-            max_y = max(max_y, v.y)
-
-        self.AABB = AABB(min_x, min_y, max_x, max_y)
+        angle = self.angle
+        if angle != self._rotation_angle:
+            self._update_rotation(angle)
 
-        return self.AABB
+        x, y = self.x, self.y
+        min_x, min_y, max_x, max_y = self._rotated_bounds
+        return self._set_AABB(min_x + x, min_y + y, max_x + x, max_y + y)
 
 
 class BoxRigidBody(PolygonRigidBody):
     def __init__(self, x, y, width, height, mass=1, angle=0, friction=0, restitution=1, static=False):
-        self.width = width
-        self.height = height
+        self._shape = [width, height]
         super().__init__(x=x, y=y, vertices=self._get_default_vertices(width, height), mass=mass, angle=angle, friction=friction, restitution=restitution, static=static)
 
     @staticmethod
@@ -103,14 +232,52 @@ class BoxRigidBody(PolygonRigidBody):
                     Vector2(-width / 2, -height / 2)]
         return vertices
 
+    @staticmethod
+    def _get_local_normals(vertices):
+        """The outward normals of the edges of _get_default_vertices, whatever the size."""
+        return [Vector2(-0.0, 1.0), Vector2(1.0, 0.0), Vector2(-0.0, -1.0), Vector2(-1.0, 0.0)]
+
+    @property
+    def width(self):
+        return self._shape[0]
+
+    @width.setter
+    def width(self, value):
+        self._shape[0] = value
+
+    @property
+    def height(self):
+        return self._shape[1]
+
+    @height.setter
+    def height(self, value):
+        self._shape[1] = value
+
     def calculate_inertia(self):
         return (1 / 12) * self.mass * (self.width ** 2 + self.height ** 2)
 
 
 class RegularPolygonRigidBody(PolygonRigidBody):
     def __init__(self, x, y, num_points, size, mass=1, angle=0, friction=0, restitution=1, static=False):
+        self._shape = [num_points, size]
         super().__init__(x=x, y=y, vertices=self._get_default_vertices(num_points, size), mass=mass, angle=angle, friction=friction, restitution=restitution, static=static)
 
+    @property
+    def num_points(self):
+        return int(self._shape[0])
+
+    @num_points.setter
+    def num_points(self, value):
+        self._shape[0] = value
+
+    @property
+    def size(self):
+        return self._shape[1]
+
+    @size.setter
+    def size(self, value):
+        self._shape[1] = value
+
     def _get_default_vertices(self, num_points, size):
         base_vector = Vector2(1, 0)
         angle = math.radians(360/num_points)
@@ -0,0 +1,139 @@
+import struct
+
+import numpy as np
+
+from .constraint import BoneConstraint, SpringConstraint
+from .exceptions import SnapshotError
+from .particle import Particle
+from .rigid_body import BoxRigidBody, CircleRigidBody, RegularPolygonRigidBody
+
+
+class Snapshot:
+    """Binary format of World.snapshot.
+
+    A snapshot is a header followed by named NumPy arrays:
+    - header: MAGIC, VERSION and the number of arrays.
+    - array: name, dtype, shape, then the raw data padded to 8 bytes.
+
+    Body state, shapes and materials included, is stored as the fields of the BodyStorage,
+    constraint endpoints and contact pairs as row indices.
+    """
+
+    MAGIC = b"MPSNAP"
+    VERSION = 2
+
+    _HEADER = struct.Struct("<6sHI")
+    _ARRAY = struct.Struct("<32s8sB")  # Name, dtype, number of dimensions
+    _DIMENSION = struct.Struct("<Q")
+
+    # Exact classes only: a subclass may hold state the snapshot doesn't know about.
+    PARTICLE, CIRCLE, BOX, REGULAR_POLYGON = range(4)
+    UNKNOWN = 255
+    BODY_KINDS = {Particle: PARTICLE, CircleRigidBody: CIRCLE, BoxRigidBody: BOX,
+                  RegularPolygonRigidBody: REGULAR_POLYGON}
+    SPRING, BONE = range(2)
+    CONSTRAINT_KINDS = {SpringConstraint: SPRING, BoneConstraint: BONE}
+
+    @staticmethod
+    def encode(arrays):
+        """Pack a dict of arrays into bytes."""
+        chunks = [Snapshot._HEADER.pack(Snapshot.MAGIC, Snapshot.VERSION, len(arrays))]
+        for name, array in arrays.items():
+            if len(name.encode()) > 32:
+                raise SnapshotError(f"Array name too long: {name}")
+            array = np.ascontiguousarray(array)
+            chunks.append(Snapshot._ARRAY.pack(name.encode(), array.dtype.str.encode(), array.ndim))
+            chunks.extend(Snapshot._DIMENSION.pack(size) for size in array.shape)
+            data = array.tobytes()
+            chunks.append(data)
+            chunks.append(bytes(-len(data) % 8))
+        return b"".join(chunks)
+
+    @staticmethod
+    def decode(data):
+        """Unpack bytes written by encode into a dict of read only arrays viewing data."""
+        data = memoryview(data)
+        if len(data) < Snapshot._HEADER.size:
+            raise SnapshotError("Truncated snapshot")
+        magic, version, count = Snapshot._HEADER.unpack_from(data)
+        if magic != Snapshot.MAGIC:
+            raise SnapshotError("Not a MatterPy snapshot")
+        if version != Snapshot.VERSION:
+            raise SnapshotError(f"Unsupported snapshot version {version}, expected {Snapshot.VERSION}")
+
+        arrays = {}
+        offset = Snapshot._HEADER.size
+        try:
+            for _ in range(count):
+                name, dtype, ndim = Snapshot._ARRAY.unpack_from(data, offset)
+                offset += Snapshot._ARRAY.size
+                shape = tuple(Snapshot._DIMENSION.unpack_from(data, offset + i * Snapshot._DIMENSION.size)[0]
+                              for i in range(ndim))
+                offset += ndim * Snapshot._DIMENSION.size
+                dtype = np.dtype(dtype.rstrip(b"\0").decode())
+                size = int(np.prod(shape)) * dtype.itemsize
+                if offset + size > len(data):
+                    raise SnapshotError("Truncated snapshot")
+                array = np.frombuffer(data[offset:offset + size], dtype=dtype).reshape(shape)
+                arrays[name.rstrip(b"\0").decode()] = array
+                offset += size + (-size % 8)
+        except struct.error:
+            raise SnapshotError("Truncated snapshot")
+        return arrays
+
+    @staticmethod
+    def get_kinds(bodies, strict=True):
+        """Return the kinds of bodies. Unless strict, bodies of other classes are given the
+        UNKNOWN kind."""
+        kinds = np.array([Snapshot.BODY_KINDS.get(type(body), Snapshot.UNKNOWN) for body in bodies],
+                         dtype=np.uint8)
+        if strict:
+            unknown = np.flatnonzero(kinds == Snapshot.UNKNOWN)
+            if len(unknown):
+                raise SnapshotError(f"Cannot snapshot bodies of type {type(bodies[unknown[0]]).__name__}")
+        return kinds
+
+    @staticmethod
+    def create_body(kind, shape):
+        """Create a body of a layout, its state is then written by the snapshot."""
+        if kind == Snapshot.PARTICLE:
+            return Particle(0, 0)
+        if kind == Snapshot.CIRCLE:
+            return CircleRigidBody(0, 0, shape[0])
+        if kind == Snapshot.BOX:
+            return BoxRigidBody(0, 0, shape[0], shape[1])
+        if kind == Snapshot.REGULAR_POLYGON:
+            return RegularPolygonRigidBody(0, 0, int(shape[0]), shape[1])
+        raise SnapshotError(f"Unknown body kind {kind}")
+
+    @staticmethod
+    def constraint_layout(constraints, storage):
+        """Return the kinds, storage rows of the endpoints and parameters of constraints.
+
+        parameters holds length, stiffness, damping and max_force, only length is used by bones.
+        """
+        kinds = np.empty(len(constraints), dtype=np.uint8)
+        endpoints = np.empty((len(constraints), 2), dtype=np.int64)
+        parameters = np.zeros((len(constraints), 4))
+        for index, constraint in enumerate(constraints):
+            kind = Snapshot.CONSTRAINT_KINDS.get(type(constraint))
+            if kind is None:
+                raise SnapshotError(f"Cannot snapshot constraints of type {type(constraint).__name__}")
+            if constraint.objA._storage is not storage or constraint.objB._storage is not storage:
+                raise SnapshotError("Cannot snapshot a constraint attached to a body outside the world")
+            kinds[index] = kind
+            endpoints[index] = constraint.objA._index, constraint.objB._index
+            if kind == Snapshot.SPRING:
+                parameters[index] = constraint.length, constraint.stiffness, constraint.damping, constraint.max_force
+            else:
+                parameters[index, 0] = constraint.length
+        return kinds, endpoints, parameters
+
+    @staticmethod
+    def create_constraint(kind, objA, objB, parameters):
+        length, stiffness, damping, max_force = parameters
+        if kind == Snapshot.SPRING:
+            return SpringConstraint(objA, objB, length, stiffness, max_force=max_force, damping=damping)
+        if kind == Snapshot.BONE:
+            return BoneConstraint(objA, objB, length)
+        raise SnapshotError(f"Unknown constraint kind {kind}")
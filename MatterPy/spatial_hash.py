@@ -0,0 +1,69 @@
+import math
+
+from .broad_phase import BroadPhase
+
+
+class SpatialHashBroadPhase(BroadPhase):
+    """Uniform grid broad phase: bodies are bucketed by the cells their AABB covers and only
+    bodies sharing a cell are compared.
+
+    If cell_size is None it is derived every step from the mean AABB size of the bodies,
+    scaled by cell_scale.
+    """
+
+    def __init__(self, cell_size=None, cell_scale=2):
+        self.cell_size = cell_size
+        self.cell_scale = cell_scale
+
+    def _get_cell_size(self, bodies):
+        if self.cell_size:
+            return self.cell_size
+
+        total = 0
+        for body in bodies:
+            aabb = body.AABB
+            total += max(aabb.max_x - aabb.min_x, aabb.max_y - aabb.min_y)
+        size = total / len(bodies) * self.cell_scale
+        return size if size > 0 else 1
+
+    def get_pairs(self, bodies):
+        pairs = set()
+        if len(bodies) < 2:
+            return pairs
+
+        inv_cell_size = 1 / self._get_cell_size(bodies)
+        floor = math.floor
+
+        cells = {}
+        for index, body in enumerate(bodies):
+            aabb = body.AABB
+            min_cx = floor(aabb.min_x * inv_cell_size)
+            min_cy = floor(aabb.min_y * inv_cell_size)
+            max_cx = floor(aabb.max_x * inv_cell_size)
+            max_cy = floor(aabb.max_y * inv_cell_size)
+
+            for cx in range(min_cx, max_cx + 1):
+                for cy in range(min_cy, max_cy + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket is None:
+                        cells[(cx, cy)] = [index]
+                    else:
+                        bucket.append(index)
+
+        # Buckets are filled in body order, so i < j holds for every candidate below
+        # and pairs come out in the same (objA, objB) order as the brute force scan.
+        candidates = set()
+        for bucket in cells.values():
+            count = len(bucket)
+            for a in range(count - 1):
+                i = bucket[a]
+                for b in range(a + 1, count):
+                    candidates.add((i, bucket[b]))
+
+        for i, j in candidates:
+            objA = bodies[i]
+            objB = bodies[j]
+            if self._is_candidate(objA, objB):
+                pairs.add((objA, objB))
+
+        return pairs
@@ -0,0 +1,27 @@
+class StepReport:
+    """What a call to World.step did: the substeps run, the substeps dropped because the
+    substep or time budget was exhausted, and the wall clock time spent running them."""
+
+    __slots__ = ("steps", "dropped_steps", "elapsed", "time_step")
+
+    def __init__(self, steps, dropped_steps, elapsed, time_step):
+        self.steps = steps
+        self.dropped_steps = dropped_steps
+        self.elapsed = elapsed
+        self.time_step = time_step
+
+    @property
+    def overloaded(self):
+        return self.dropped_steps > 0
+
+    @property
+    def simulated_time(self):
+        return self.steps * self.time_step
+
+    @property
+    def dropped_time(self):
+        return self.dropped_steps * self.time_step
+
+    def __repr__(self):
+        return (f"StepReport(steps={self.steps}, dropped_steps={self.dropped_steps}, "
+                f"elapsed={self.elapsed:.6f}, time_step={self.time_step:.6f})")
@@ -0,0 +1,82 @@
+from .broad_phase import BroadPhase
+
+
+class _Endpoint:
+    __slots__ = ("body", "is_min", "value")
+
+    def __init__(self, body, is_min):
+        self.body = body
+        self.is_min = is_min
+        self.value = 0.0
+
+    def key(self):
+        # At equal values max endpoints go first: touching AABBs don't overlap.
+        return self.value, self.is_min
+
+
+class SweepAndPruneBroadPhase(BroadPhase):
+    """Sort and sweep broad phase along the x axis.
+
+    The endpoint list is kept between steps and repaired with an insertion sort, which is
+    close to linear when bodies barely move from one step to the next.
+    """
+
+    def __init__(self):
+        self._endpoints = []
+        self._bodies = set()
+
+    def _sync_bodies(self, bodies):
+        if len(bodies) == len(self._bodies) and all(body in self._bodies for body in bodies):
+            return
+
+        current = set(bodies)
+        if self._bodies - current:
+            self._endpoints = [endpoint for endpoint in self._endpoints if endpoint.body in current]
+        for body in bodies:
+            if body not in self._bodies:
+                # New endpoints are appended, the insertion sort moves them in place.
+                self._endpoints.append(_Endpoint(body, True))
+                self._endpoints.append(_Endpoint(body, False))
+        self._bodies = current
+
+    def _update_endpoints(self):
+        for endpoint in self._endpoints:
+            aabb = endpoint.body.AABB
+            endpoint.value = aabb.min_x if endpoint.is_min else aabb.max_x
+
+    def _insertion_sort(self):
+        endpoints = self._endpoints
+        for i in range(1, len(endpoints)):
+            endpoint = endpoints[i]
+            key = endpoint.key()
+            j = i - 1
+            while j >= 0 and endpoints[j].key() > key:
+                endpoints[j + 1] = endpoints[j]
+                j -= 1
+            endpoints[j + 1] = endpoint
+
+    def get_pairs(self, bodies):
+        self._sync_bodies(bodies)
+        self._update_endpoints()
+        self._insertion_sort()
+
+        order = {body: index for index, body in enumerate(bodies)}
+
+        pairs = set()
+        active = []
+        for endpoint in self._endpoints:
+            body = endpoint.body
+            if not endpoint.is_min:
+                active.remove(body)
+                continue
+
+            for other in active:
+                if order[other] < order[body]:
+                    objA, objB = other, body
+                else:
+                    objA, objB = body, other
+                if self._is_candidate(objA, objB):
+                    pairs.add((objA, objB))
+            active.append(body)
+
+        return pairs
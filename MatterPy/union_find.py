@@ -0,0 +1,45 @@
+class UnionFind:
+    """Disjoint sets of hashable items, with path halving and union by size."""
+
+    def __init__(self, items=()):
+        self._parent = {}
+        self._size = {}
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return len(self._parent)
+
+    def __contains__(self, item):
+        return item in self._parent
+
+    def add(self, item):
+        if item not in self._parent:
+            self._parent[item] = item
+            self._size[item] = 1
+
+    def find(self, item):
+        parent = self._parent
+        while parent[item] is not item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a, b):
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a is root_b:
+            return root_a
+
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size.pop(root_b)
+        return root_a
+
+    def groups(self):
+        """Return the sets as lists, ordered by their first item in insertion order."""
+        groups = {}
+        for item in self._parent:
+            groups.setdefault(self.find(item), []).append(item)
+        return list(groups.values())
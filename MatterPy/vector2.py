@@ -2,6 +2,8 @@ import math
 
 
 class Vector2:
+    __slots__ = ("x", "y")
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -24,8 +26,58 @@ class Vector2:
     def __neg__(self):
         return Vector2(-self.x, -self.y)
 
+    # In place operators and helpers: they modify self instead of allocating a new Vector2,
+    # so hot loops can work on a few preallocated scratch vectors.
+
+    def __iadd__(self, other):
+        self.x += other.x
+        self.y += other.y
+        return self
+
+    def __isub__(self, other):
+        self.x -= other.x
+        self.y -= other.y
+        return self
+
+    def __imul__(self, other: float):
+        self.x *= other
+        self.y *= other
+        return self
+
+    def __itruediv__(self, other: float):
+        self.x /= other
+        self.y /= other
+        return self
+
+    def set(self, x, y):
+        self.x = x
+        self.y = y
+        return self
+
+    def copy(self):
+        return Vector2(self.x, self.y)
+
+    def add_scaled(self, other, scalar: float):
+        """self += other * scalar without a temporary vector."""
+        self.x += other.x * scalar
+        self.y += other.y * scalar
+        return self
+
+    def sub_into(self, other, target):
+        """Write self - other into target and return it."""
+        target.x = self.x - other.x
+        target.y = self.y - other.y
+        return target
+
+    def normalize_into(self, target):
+        """Write the normalized vector into target and return it."""
+        length = self.length()
+        if length == 0:
+            return target.set(0, 0)
+        return target.set(self.x / length, self.y / length)
+
     def length(self) -> float:
-        return (self.x ** 2 + self.y ** 2) ** 0.5
+        return math.sqrt(self.x * self.x + self.y * self.y)
 
     def normalize(self):
         length = self.length()
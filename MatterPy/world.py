@@ -1,27 +1,103 @@
+import gc
+import math
 import time
 
+import numpy as np
+
+from .aabb_tree import AABBTree
+from .body_storage import BodyStorage
+from .batch_collision import BatchCollisionManager
+from .broad_phase import BruteForceBroadPhase
 from .collision_manager import CollisionManager
 from .composite import Composite
-from .constraint import Constraint
-from .exceptions import NonPhysicalObjectError
+from .constraint import BoneConstraint, Constraint, SpringConstraint
+from .constraint_batch import BoneBatch, SpringBatch
+from .contact import Contact, ContactManifold
+from .exceptions import NonPhysicalObjectError, ObjectNotInWorld
+from .integrator import BatchIntegrator
 from .vector2 import Vector2
 from .particle import Particle
-from .rigid_body import RigidBody
+from .rigid_body import CircleRigidBody, PolygonRigidBody, RigidBody
+from .snapshot import Snapshot
+from .step_report import StepReport
+from .union_find import UnionFind
 
 class World:
-    def __init__(self, gravity=Vector2(0, 0)):
+    def __init__(self, gravity=None, broad_phase=None, batched=False, allow_sleeping=False):
         self._particles = []
         self._rigid_bodies = []
         self._constraints = []
+        # Built lazily in batched mode, reset when constraints change
+        self._spring_batch = None
+        self._bone_batch = None
+        self._unbatched_constraints = []
+        self.bone_iterations = 1  # Projection passes of the batched BoneConstraint solver
+
+        # State of every body of the world, particles are views on its arrays.
+        self._storage = BodyStorage()
+
+        # Static bodies are kept out of the integration and broad phase lists, dynamic bodies
+        # are only tested against _static_index, which is rebuilt when it is invalidated.
+        self._dynamic_objects = []
+        self._dynamic_rigid_bodies = []
+        self._static_rigid_bodies = []
+        self._static_index = None
+        self._order = {}
+        self._next_order = 0
+
+        # Islands of bodies that stay slow long enough are put to sleep together: they are not
+        # integrated and only tested against awake bodies, through _sleeping_index.
+        self.allow_sleeping = allow_sleeping
+        self.sleep_linear_threshold = 5
+        self.sleep_angular_threshold = 1
+        self.time_to_sleep = 0.5
+        self._sleeping_islands = []
+        self._sleeping_count = 0
+        self._sleeping_index = None
+        self._awake_objects = None  # (objects, rigid bodies), rebuilt when the sleep state changes
 
         self._aabb_pairs = set()
-        self.gravity = gravity
+        # Manifolds of the pairs that collided at the last step, their impulses are reapplied
+        # before solving when warm_starting is on.
+        self._contacts = {}
+        self._previous_contacts = {}
+        self.warm_starting = True
+        self.contact_match_distance = 2  # New contact points this close to an old one keep its impulse
+        self.contact_tolerance = 0.5  # Polygon contact points this close to touching are kept
+        self.velocity_iterations = 8
+        self.restitution_threshold = 50  # Slower impacts don't bounce, so resting contacts settle
+        self.position_correction = 0.8  # Part of the penetration removed at every step
+        self.penetration_slop = 0.1
+        self.position_iterations = 3  # Passes separating the colliding pairs again after the solver
+        self.broad_phase = broad_phase if broad_phase is not None else BruteForceBroadPhase()
+        self.gravity = gravity if gravity is not None else Vector2(0, 0)
+        self.batched = batched  # Use the vectorized NumPy kernels instead of per-object steps
         self.current_time = time.time()
         self.accumulator = 0
+        # Stacks are less still at 1/60: in benchmarks/contact_solver.py the tower drifts about
+        # three times as far as at 1/120 even with twice the velocity_iterations, which then
+        # cost about as much as running at 1/120.
         self.time_step = 1 / 120
 
+        # Limits of a call to step, the simulated time that doesn't fit is dropped and reported
+        # to on_overload. max_substeps only applies when step measures the elapsed time itself.
+        self.max_substeps = 4
+        self.frame_budget = None  # Wall clock seconds
+        self.on_overload = None  # Called with the StepReport of overloaded steps
+        # With adaptive_time_step, time_step is doubled after overload_frames overloaded steps
+        # in a row, up to max_time_step, and halved back once the steps fit again.
+        self.adaptive_time_step = False
+        self.max_time_step = 1 / 30
+        self.overload_frames = 3
+        self._base_time_step = None
+        self._overloaded_frames = 0
+        self._relaxed_frames = 0
+
         self.collision_handlers = {}
         self._to_remove = set()  # For deferring removals
+        self.recorder = None  # Given the world after every substep, see TrajectoryRecorder
+        self.profiler = None  # Collects the timings and counters of every substep, see Profiler
+        self._body_layout = None  # Storage, version, kinds and order of the rows
 
     @property
     def rigid_body_count(self):
@@ -39,6 +115,22 @@ class World:
     def constraints(self):
         return self._constraints
 
+    @property
+    def storage(self):
+        return self._storage
+
+    @property
+    def static_bodies(self):
+        return self._static_rigid_bodies
+
+    @property
+    def sleeping_islands(self):
+        return self._sleeping_islands
+
+    @property
+    def sleeping_bodies(self):
+        return [body for island in self._sleeping_islands for body in island]
+
     def add_collision_handler(self, typeA, typeB, begin=None, separate=None):
         self.collision_handlers[(typeA, typeB)] = {
             "begin": begin,
@@ -46,33 +138,117 @@ class World:
         }
 
     def add(self, *objs):
+        self._storage.extend(obj for obj in objs if isinstance(obj, Particle))
         for obj in objs:
             if isinstance(obj, RigidBody):
                 self._rigid_bodies.append(obj)
+                self._add_body(obj)
             elif isinstance(obj, Particle):
                 self._particles.append(obj)
+                self._add_body(obj)
             elif isinstance(obj, Constraint):
                 self._constraints.append(obj)
+                self._spring_batch = None
+                obj.objA.wake()
+                obj.objB.wake()
             elif isinstance(obj, Composite):
-                for body in obj.objects:
-                    self.add(body)
+                self.add(*obj.objects)
             else:
                 raise NonPhysicalObjectError
 
+    def _add_body(self, obj):
+        self._order[obj] = self._next_order
+        self._next_order += 1
+        self._storage.add(obj)
+        obj.wake()
+        self._partition(obj)
+        self._wake_around(obj)
+
+    def _remove_body(self, obj):
+        if self._order.pop(obj, None) is None:
+            return False
+        obj.wake()  # Wakes the rest of its island if it was sleeping
+        self._wake_around(obj)
+        self._unpartition(obj)
+        self._storage.remove(obj)
+        return True
+
+    def _remove_contacts(self, bodies):
+        """Forget the manifolds of the removed bodies, so the solver and snapshot never see them."""
+        for contacts in (self._contacts, self._previous_contacts):
+            for pair in [pair for pair in contacts if pair[0] in bodies or pair[1] in bodies]:
+                del contacts[pair]
+
+    def _partition(self, obj):
+        self._awake_objects = None
+        if obj.static:
+            self._prepare_static(obj)
+            if isinstance(obj, RigidBody):
+                self._static_rigid_bodies.append(obj)
+                self._static_index = None
+        else:
+            self._dynamic_objects.append(obj)
+            if isinstance(obj, RigidBody):
+                self._dynamic_rigid_bodies.append(obj)
+
+    def _unpartition(self, obj):
+        self._awake_objects = None
+        for lst in (self._dynamic_objects, self._dynamic_rigid_bodies):
+            if obj in lst:
+                lst.remove(obj)
+        if obj in self._static_rigid_bodies:
+            self._static_rigid_bodies.remove(obj)
+            self._static_index = None
+
+    @staticmethod
+    def _prepare_static(obj):
+        """Static bodies are never stepped, so settle their state and geometry once."""
+        obj.velocity *= 0
+        obj.force *= 0
+        obj.wake()
+        if isinstance(obj, RigidBody):
+            obj.update_geometry()
+
+    def update_static(self, *objs):
+        """Must be called after moving a static body or changing the static flag of a body
+        of this world. Without arguments every body is checked again."""
+        if not objs:
+            objs = self._particles + self._rigid_bodies
+
+        for obj in objs:
+            if obj not in self._order:
+                raise ObjectNotInWorld
+            self._unpartition(obj)
+            self._partition(obj)
+
+        self._dynamic_objects.sort(key=self._order.get)
+        self._dynamic_rigid_bodies.sort(key=self._order.get)
+        self._static_rigid_bodies.sort(key=self._order.get)
+        self._static_index = None
+
     def remove(self, *objs):
         """Removes the given objects immediately from their respective lists."""
+        removed = set()
         for obj in objs:
             if isinstance(obj, RigidBody):
                 self._remove_from_list(self._rigid_bodies, obj)
+                if self._remove_body(obj):
+                    removed.add(obj)
             elif isinstance(obj, Particle):
                 self._remove_from_list(self._particles, obj)
+                if self._remove_body(obj):
+                    removed.add(obj)
             elif isinstance(obj, Constraint):
                 self._remove_from_list(self._constraints, obj)
+                self._spring_batch = None
+                obj.objA.wake()
+                obj.objB.wake()
             elif isinstance(obj, Composite):
-                for body in obj.objects:
-                    self.remove(body)
+                self.remove(*obj.objects)
             else:
                 print(f"Warning: Object {obj} not found in world.")
+        if removed:
+            self._remove_contacts(removed)
 
     def _remove_from_list(self, lst, obj):
         """Helper function to remove an object from a list with proper error handling."""
@@ -88,113 +264,932 @@ class World:
                 self._to_remove.add(obj)
 
     def _process_removals(self):
-        """Process the removals deferred using remove_later."""
-        for obj in self._to_remove:
-            self.remove(obj)
+        """Process the removals deferred using remove_later, in the order the objects were added."""
+        self.remove(*sorted(self._to_remove, key=lambda obj: self._order.get(obj, -1)))
         self._to_remove.clear()
 
-    def step(self):
-        last_time = self.current_time
-        self.current_time = time.time()
-        dt = self.current_time - last_time
-        self.accumulator += dt
+    def step(self, dt=None, budget=None):
+        """Advance the simulation by dt seconds in substeps of time_step, the remainder is kept
+        for the next call. Without dt, the time elapsed since the last call is used and at most
+        max_substeps substeps are run.
 
-        iterations = 0
-        total_simulation_time = 0
+        budget (frame_budget by default) limits the wall clock seconds spent running substeps.
+        Returns a StepReport, simulated time left over by the limits is dropped. The substeps
+        are only timed when there is a budget or an on_overload callback, elapsed is 0 otherwise.
+        """
+        if dt is None:
+            last_time = self.current_time
+            self.current_time = time.time()
+            dt = self.current_time - last_time
+            max_steps = self.max_substeps
+        else:
+            max_steps = None
+        if budget is None:
+            budget = self.frame_budget
+
+        self.accumulator += dt
+        time_step = self.time_step
 
-        while self.accumulator >= self.time_step:
-            self.accumulator -= self.time_step
-            iterations += 1
-            total_simulation_time += self.time_step
-            if iterations > 4:
-                print("Simulation time exceeded: skipping remaining steps")
+        steps = 0
+        elapsed = 0
+        timed = budget is not None or self.on_overload is not None
+        if timed:
+            start_time = time.perf_counter()
+        while self.accumulator >= time_step:
+            if max_steps is not None and steps >= max_steps:
                 break
+            if budget is not None and steps and elapsed >= budget:
+                break
+            self.accumulator -= time_step
+            self._substep()
+            steps += 1
+            if timed:
+                elapsed = time.perf_counter() - start_time
+
+        dropped_steps = int(self.accumulator / time_step)
+        self.accumulator -= dropped_steps * time_step
+
+        report = StepReport(steps, dropped_steps, elapsed, time_step)
+        if report.overloaded and self.on_overload is not None:
+            self.on_overload(report)
+        if self.adaptive_time_step:
+            self._adapt_time_step(report, max_steps, budget)
+        return report
+
+    def _adapt_time_step(self, report, max_steps, budget):
+        if report.overloaded:
+            self._overloaded_frames += 1
+            self._relaxed_frames = 0
+        elif ((max_steps is None or report.steps * 2 <= max_steps) and
+              (budget is None or report.elapsed * 2 <= budget)):
+            # Twice the substeps would still have fit
+            self._overloaded_frames = 0
+            self._relaxed_frames += 1
+        else:
+            self._overloaded_frames = 0
+            self._relaxed_frames = 0
+
+        if self._overloaded_frames >= self.overload_frames and self.time_step * 2 <= self.max_time_step:
+            if self._base_time_step is None:
+                self._base_time_step = self.time_step
+            self.time_step *= 2
+            self._overloaded_frames = 0
+        elif (self._base_time_step is not None and self._relaxed_frames >= self.overload_frames and
+              self.time_step > self._base_time_step):
+            self.time_step /= 2
+            self._relaxed_frames = 0
+            if self.time_step <= self._base_time_step:
+                self._base_time_step = None
+
+    def advance(self, steps=1):
+        """Run exactly steps substeps of time_step, without reading the clock."""
+        for _ in range(steps):
+            self._substep()
+
+    def run(self, duration, callback=None):
+        """Simulate duration seconds as fast as possible, calling callback(world, step) after
+        every substep if given. Returns the number of substeps run."""
+        steps = round(duration / self.time_step)
+        if callback is None:
+            self.advance(steps)
+        else:
+            for step in range(steps):
+                self._substep()
+                callback(self, step)
+        return steps
+
+    def _substep(self):
+        if self.profiler is not None:
+            self._profiled_substep(self.profiler)
+            return
+
+        self._wake_islands()
+        self._step_objects()
+        self._broad_phase()
+        self._narrow_phase()
+        self._update_sleeping()
+        self._process_removals()
+        if self.recorder is not None:
+            self.recorder.record(self)
 
-            self._step_objects()
-            self._broad_phase()
-            self._narrow_phase()
+    def _profiled_substep(self, profiler):
+        """_substep, timing every phase."""
+        clock = time.perf_counter
+        profiler.begin_substep()
 
+        start = clock()
+        self._wake_islands()
+        profiler.phase("sleeping", start, clock())
+
+        profiler.count("bodies_integrated", len(self._get_awake_objects()[0]))
+        constraints = len(self._constraints)
+        start = clock()
+        self._step_objects()
+        profiler.phase("step_objects", start, clock())
+        profiler.count("broken_constraints", constraints - len(self._constraints))
+
+        start = clock()
+        self._broad_phase()
+        profiler.phase("broad_phase", start, clock())
+        profiler.count("candidate_pairs", len(self._aabb_pairs))
+
+        start = clock()
+        self._narrow_phase()
+        profiler.phase("narrow_phase", start, clock())
+        profiler.count("contacts", len(self._contacts))
+
+        start = clock()
+        self._update_sleeping()
+        profiler.phase("sleeping", start, clock())
+
+        start = clock()
         self._process_removals()
+        profiler.phase("removals", start, clock())
+
+        if self.recorder is not None:
+            self.recorder.record(self)
+        profiler.end_substep()
+
+    def snapshot(self):
+        """Return the state of the world as bytes, see restore.
+
+        Only Particle, the rigid bodies of MatterPy and its spring and bone constraints are
+        supported. Collision handlers and the broad phase aren't part of the state.
+        """
+        storage = self._storage
+        count = storage.count
+        kinds, order = self._get_body_layout()
+        constraint_kinds, endpoints, parameters = Snapshot.constraint_layout(self._constraints, storage)
+
+        islands = np.full(count, -1, dtype=np.int32)
+        for island_index, island in enumerate(self._sleeping_islands):
+            islands[[obj._index for obj in island]] = island_index
+
+        manifolds = list(self._contacts.values())
+        contact_pairs = np.array([(manifold.objA._index, manifold.objB._index) for manifold in manifolds],
+                                 dtype=np.int64).reshape(-1, 2)
+        contact_normals = np.array([(manifold.normal.x, manifold.normal.y, manifold.depth)
+                                    for manifold in manifolds], dtype=float).reshape(-1, 3)
+        contact_counts = np.array([len(manifold.contacts) for manifold in manifolds], dtype=np.int64)
+        contact_points = np.array([(contact.point.x, contact.point.y, contact.normal_impulse, contact.tangent_impulse)
+                                   for manifold in manifolds for contact in manifold.contacts],
+                                  dtype=float).reshape(-1, 4)
+
+        arrays = {"world": np.array([self.gravity.x, self.gravity.y, self.time_step, self.accumulator,
+                                     self._next_order], dtype=float)}
+        for name in storage.FIELDS:
+            arrays[name] = getattr(storage, name)[:count]
+        arrays.update(order=order, kinds=kinds,
+                      constraint_kinds=constraint_kinds, constraint_endpoints=endpoints,
+                      constraint_parameters=parameters, islands=islands,
+                      contact_pairs=contact_pairs, contact_normals=contact_normals,
+                      contact_counts=contact_counts, contact_points=contact_points)
+        return Snapshot.encode(arrays)
+
+    def restore(self, data):
+        """Bring the world back to the state saved by snapshot.
+
+        When the world still holds bodies of the same kinds and shapes in the same storage
+        rows, e.g. when going back to a checkpoint of this world, their state is copied in
+        place. Otherwise every body and constraint is replaced by new ones.
+        """
+        arrays = Snapshot.decode(data)
+        kinds = arrays["kinds"]
+        shapes = arrays["shape"]
+        order = arrays["order"]
+
+        current_kinds, current_order = self._get_body_layout()
+        rebuilt = not (np.array_equal(kinds, current_kinds) and
+                       np.array_equal(shapes, self._storage.shape[:self._storage.count]))
+        if rebuilt:
+            self._rebuild_bodies(kinds, shapes)
+
+        storage = self._storage
+        count = storage.count
+        bodies = storage.bodies
+        static_changed = not np.array_equal(storage.static[:count], arrays["static"])
+        for name in storage.FIELDS:
+            getattr(storage, name)[:count] = arrays[name]
+
+        rows = np.argsort(order, kind="stable")
+        if rebuilt or static_changed or not np.array_equal(order, current_order):
+            ordered = [bodies[row] for row in rows.tolist()]
+            self._order = dict(zip(ordered, order[rows].tolist()))
+            self._restore_partitions(ordered, storage.static[rows].tolist())
+        self._body_layout = (storage, storage.version, kinds.copy(), order.copy())
+
+        gravity_x, gravity_y, self.time_step, self.accumulator, next_order = arrays["world"].tolist()
+        self.gravity = Vector2(gravity_x, gravity_y)
+        self._next_order = int(next_order)
+
+        self._restore_constraints(arrays["constraint_kinds"], arrays["constraint_endpoints"],
+                                  arrays["constraint_parameters"])
+
+        # Sleeping rows in the order the bodies were added, grouped by island
+        islands = {}
+        island_rows = rows[arrays["islands"][rows] >= 0]
+        for row, island in zip(island_rows.tolist(), arrays["islands"][island_rows].tolist()):
+            islands.setdefault(island, []).append(bodies[row])
+        self._sleeping_islands = [islands[island] for island in sorted(islands)]
+        self._sleeping_count = len(island_rows)
+        self._sleeping_index = None
+        self._awake_objects = None
+
+        self._restore_contacts(arrays["contact_pairs"], arrays["contact_normals"], arrays["contact_counts"],
+                               arrays["contact_points"])
+        self._aabb_pairs = set()
+        self._to_remove.clear()
+        self.current_time = time.time()
+
+        # Awake bodies update their geometry when they are stepped
+        self._static_index = None
+        for obj in self._static_rigid_bodies:
+            obj.update_geometry()
+        for obj in self.sleeping_bodies:
+            if isinstance(obj, RigidBody):
+                obj.update_geometry()
+
+    def _get_body_layout(self):
+        """Return the kinds and order of the rows of the storage, they only change when bodies are
+        added or removed."""
+        storage = self._storage
+        layout = self._body_layout
+        if layout is None or layout[0] is not storage or layout[1] != storage.version:
+            bodies = storage.bodies
+            layout = (storage, storage.version, Snapshot.get_kinds(bodies),
+                      np.array([self._order[body] for body in bodies], dtype=np.int64))
+            self._body_layout = layout
+        return layout[2:]
+
+    def _rebuild_bodies(self, kinds, shapes):
+        """Replace every body of the world by new bodies of the given layout, one per row. The
+        state of the bodies, their order and partitions are left to restore."""
+        self._storage = BodyStorage(capacity=max(len(kinds), 1))
+        self._particles = []
+        self._rigid_bodies = []
+        self._constraints = []
+        self._spring_batch = None
+        self._dynamic_objects = []
+        self._dynamic_rigid_bodies = []
+        self._static_rigid_bodies = []
+        self._static_index = None
+        self._order = {}
+        self._sleeping_islands = []
+        self._sleeping_count = 0
+        self._sleeping_index = None
+        self._awake_objects = None
+        self._contacts = {}
+        self._previous_contacts = {}
+
+        # Creating that many objects at once runs full garbage collections over and over, and
+        # the new bodies aren't garbage.
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._storage.attach([Snapshot.create_body(kind, shape)
+                                  for kind, shape in zip(kinds.tolist(), shapes.tolist())])
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def _restore_partitions(self, ordered, static):
+        rigid = [isinstance(obj, RigidBody) for obj in ordered]
+        self._particles = [obj for obj, is_rigid in zip(ordered, rigid) if not is_rigid]
+        self._rigid_bodies = [obj for obj, is_rigid in zip(ordered, rigid) if is_rigid]
+        self._dynamic_objects = [obj for obj, is_static in zip(ordered, static) if not is_static]
+        self._dynamic_rigid_bodies = [obj for obj, is_rigid, is_static in zip(ordered, rigid, static)
+                                      if is_rigid and not is_static]
+        self._static_rigid_bodies = [obj for obj, is_rigid, is_static in zip(ordered, rigid, static)
+                                     if is_rigid and is_static]
+        self._static_index = None
+        self._awake_objects = None
+
+    def _restore_constraints(self, kinds, endpoints, parameters):
+        storage = self._storage
+        current_kinds, current_endpoints, current_parameters = Snapshot.constraint_layout(self._constraints, storage)
+        self._spring_batch = None
+        if np.array_equal(kinds, current_kinds) and np.array_equal(endpoints, current_endpoints):
+            # Same constraints, only write the parameters that changed
+            for index in np.flatnonzero((parameters != current_parameters).any(axis=1)).tolist():
+                constraint = self._constraints[index]
+                length, stiffness, damping, max_force = parameters[index].tolist()
+                constraint.length = length
+                if kinds[index] == Snapshot.SPRING:
+                    constraint.stiffness = stiffness
+                    constraint.damping = damping
+                    constraint.max_force = max_force
+            return
+
+        bodies = storage.bodies
+        self._constraints = [Snapshot.create_constraint(kind, bodies[a], bodies[b], constraint_parameters)
+                             for kind, (a, b), constraint_parameters
+                             in zip(kinds.tolist(), endpoints.tolist(), parameters.tolist())]
+
+    def _restore_contacts(self, pairs, normals, counts, points):
+        bodies = self._storage.bodies
+        points = points.tolist()
+        contacts = {}
+        start = 0
+        for (a, b), (normal_x, normal_y, depth), count in zip(pairs.tolist(), normals.tolist(), counts.tolist()):
+            manifold = ContactManifold(bodies[a], bodies[b])
+            manifold.normal = Vector2(normal_x, normal_y)
+            manifold.depth = depth
+            for x, y, normal_impulse, tangent_impulse in points[start:start + count]:
+                contact = Contact(Vector2(x, y))
+                contact.normal_impulse = normal_impulse
+                contact.tangent_impulse = tangent_impulse
+                manifold.contacts.append(contact)
+            start += count
+            contacts[(manifold.objA, manifold.objB)] = manifold
+        self._contacts = contacts
+        self._previous_contacts = {}
 
     def _step_objects(self):
         """Step through all objects, applying forces and updating positions."""
+        awake_objects, awake_rigid_bodies = self._get_awake_objects()
+
+        profiler = self.profiler
+        if profiler is not None:
+            start = time.perf_counter()
+        if self.batched:
+            self._step_constraints_batched()
+        else:
+            self._step_constraints()
+        if profiler is not None:
+            profiler.phase("constraints", start, time.perf_counter())
+
+        if self.batched:
+            BatchIntegrator.integrate(self._storage, self.gravity, self.time_step)
+            for obj in awake_rigid_bodies:
+                obj.update_geometry()
+            return
+
+        gravity = self.gravity
+        for obj in awake_objects:
+            obj.force.add_scaled(gravity, obj.mass)
+            obj.step(self.time_step)
+
+    def _step_constraints(self):
+        skip_sleeping = self._sleeping_count > 0
         for constraint in reversed(self._constraints):
+            if skip_sleeping and self._is_asleep(constraint.objA) and self._is_asleep(constraint.objB):
+                continue
             constraint.step(self.time_step)
             if constraint.broken:
                 self._constraints.remove(constraint)
 
-        for obj in self.particles + self.rigid_bodies:
-            obj.force += self.gravity * obj.mass
-            obj.step(self.time_step)
+    @staticmethod
+    def _is_asleep(obj):
+        return obj.sleeping or obj.static
+
+    def _get_awake_objects(self):
+        if self._awake_objects is None:
+            if self._sleeping_count:
+                self._awake_objects = ([obj for obj in self._dynamic_objects if not obj.sleeping],
+                                       [obj for obj in self._dynamic_rigid_bodies if not obj.sleeping])
+            else:
+                self._awake_objects = (self._dynamic_objects, self._dynamic_rigid_bodies)
+        return self._awake_objects
+
+    def _build_islands(self, bodies):
+        """Group bodies connected by an AABB pair or a constraint, static bodies don't connect."""
+        islands = UnionFind(bodies)
+        for objA, objB in self._aabb_pairs:
+            if objA in islands and objB in islands:
+                islands.union(objA, objB)
+        for constraint in self._constraints:
+            if constraint.objA in islands and constraint.objB in islands:
+                islands.union(constraint.objA, constraint.objB)
+        return islands.groups()
+
+    def _update_sleeping(self):
+        """Advance the sleep timers and put to sleep the islands whose bodies all stayed slow for
+        time_to_sleep."""
+        if not self.allow_sleeping:
+            if self._sleeping_islands:
+                for island in self._sleeping_islands:
+                    for obj in island:
+                        obj.wake()
+                self._wake_islands()
+            return
+
+        storage = self._storage
+        count = storage.count
+        velocity = storage.velocity[:count]
+        angular_velocity = storage.angular_velocity[:count]
+        sleep_time = storage.sleep_time[:count]
+
+        awake = ~(storage.static[:count] | storage.sleeping[:count])
+        slow = ((velocity[:, 0] * velocity[:, 0] + velocity[:, 1] * velocity[:, 1] <=
+                 self.sleep_linear_threshold * self.sleep_linear_threshold) &
+                (angular_velocity * angular_velocity <= self.sleep_angular_threshold * self.sleep_angular_threshold))
+        sleep_time[awake & slow] += self.time_step
+        sleep_time[awake & ~slow] = 0
+
+        ready = awake & (sleep_time >= self.time_to_sleep)
+        if not ready.any():
+            return
+
+        ready = ready.tolist()
+        for island in self._build_islands(self._get_awake_objects()[0]):
+            if not all(ready[obj._index] for obj in island):
+                continue
+
+            for obj in island:
+                obj.velocity.set(0, 0)  # Before the flag, writing the velocity wakes the body
+                obj.force.set(0, 0)
+                if isinstance(obj, RigidBody):
+                    obj.angular_velocity = 0
+                obj.sleeping = True
+            self._sleeping_islands.append(island)
+            self._sleeping_count += len(island)
+            self._sleeping_index = None
+            self._awake_objects = None
+
+    def _wake_islands(self):
+        """Wake the sleeping islands that have a member woken since the last step, by a contact
+        or a write to its position, velocity, angle or angular velocity."""
+        if not self._sleeping_islands:
+            return
+
+        storage = self._storage
+        if np.count_nonzero(storage.sleeping[:storage.count]) == self._sleeping_count:
+            return
+
+        sleeping_islands = []
+        for island in self._sleeping_islands:
+            if all(obj.sleeping and obj._storage is storage for obj in island):
+                sleeping_islands.append(island)
+            else:
+                for obj in island:
+                    obj.wake()
+
+        self._sleeping_islands = sleeping_islands
+        self._sleeping_count = sum(len(island) for island in sleeping_islands)
+        self._sleeping_index = None
+        self._awake_objects = None
+
+    def _wake_around(self, obj):
+        """Wake the sleeping bodies overlapping a body added to or removed from the world."""
+        if not self._sleeping_islands or not isinstance(obj, RigidBody):
+            return
+
+        for other in self._get_sleeping_index().query(obj.get_AABB()):
+            other.wake()
+
+    def _get_sleeping_index(self):
+        if self._sleeping_index is None:
+            self._sleeping_index = AABBTree(margin=0)
+            for island in self._sleeping_islands:
+                for obj in island:
+                    if isinstance(obj, RigidBody):
+                        self._sleeping_index.insert(obj, obj.AABB)
+        return self._sleeping_index
+
+    def _build_constraint_batches(self):
+        storage = self._storage
+        if self._spring_batch is not None and self._spring_batch.version == storage.version:
+            return
+
+        springs = []
+        bones = []
+        self._unbatched_constraints = []
+        for constraint in self._constraints:
+            if constraint.objA._storage is not storage or constraint.objB._storage is not storage:
+                self._unbatched_constraints.append(constraint)
+            elif isinstance(constraint, SpringConstraint):
+                springs.append(constraint)
+            elif isinstance(constraint, BoneConstraint):
+                bones.append(constraint)
+            else:
+                self._unbatched_constraints.append(constraint)
+
+        self._spring_batch = SpringBatch(springs, storage)
+        self._bone_batch = BoneBatch(bones, storage)
+
+    def _step_constraints_batched(self):
+        self._build_constraint_batches()
+        batch = self._spring_batch
+        broken = batch.step(self._storage, self.time_step)
+        self._bone_batch.solve(self._storage, self.time_step, self.bone_iterations)
+
+        for constraint in reversed(self._unbatched_constraints):
+            constraint.step(self.time_step)
+            if constraint.broken:
+                self._unbatched_constraints.remove(constraint)
+                self._constraints.remove(constraint)
+
+        if broken.any():
+            for index in np.flatnonzero(broken):
+                batch.springs[index].broken = True
+            batch.compress(~broken)
+            self._constraints = [constraint for constraint in self._constraints if not constraint.broken]
 
     def _broad_phase(self):
         """Perform broad phase collision detection."""
-        self._aabb_pairs.clear()
-        for i in range(self.rigid_body_count - 1):
-            objA = self._rigid_bodies[i]
-
-            for j in range(i + 1, self.rigid_body_count):
-                objB = self._rigid_bodies[j]
+        awake_rigid_bodies = self._get_awake_objects()[1]
+        self._aabb_pairs = self.broad_phase.get_pairs(awake_rigid_bodies)
 
-                if objA.static and objB.static:
-                    continue  # Skip static vs static checks
+        if self._static_rigid_bodies:
+            self._query_index(self._get_static_index(), awake_rigid_bodies)
+        if self._sleeping_count:
+            self._query_index(self._get_sleeping_index(), awake_rigid_bodies)
 
+    def _query_index(self, index, bodies):
+        """Add the pairs between bodies and the bodies of an AABBTree built with margin=0."""
+        order = self._order
+        for objA in bodies:
+            for objB in index.query(objA.AABB):
                 if not CollisionManager.intersect_AABB(objA.AABB, objB.AABB):
                     continue
 
-                self._aabb_pairs.add((objA, objB))
+                if order[objB] < order[objA]:
+                    self._aabb_pairs.add((objB, objA))
+                else:
+                    self._aabb_pairs.add((objA, objB))
+
+    def _get_static_index(self):
+        if self._static_index is None:
+            self._static_index = AABBTree(margin=0)
+            for obj in self._static_rigid_bodies:
+                self._static_index.insert(obj, obj.AABB)
+        return self._static_index
+
+    @property
+    def contacts(self):
+        return self._contacts
 
     def _narrow_phase(self):
         """Perform narrow phase collision detection."""
-        for objA, objB in self._aabb_pairs:
-            collision, normal, depth = CollisionManager.is_collide(objA, objB)
+        self._previous_contacts = self._contacts
+        self._contacts = {}
+
+        # Broad phases return sets, sort the pairs so that the results don't depend on the
+        # memory addresses of the bodies.
+        order = self._order
+        pairs = sorted(self._aabb_pairs, key=lambda pair: (order[pair[0]], order[pair[1]]))
+        if self.batched:
+            manifolds = self._narrow_phase_batched(pairs)
+        else:
+            manifolds = []
+            for objA, objB in pairs:
+                collision, normal, depth = CollisionManager.is_collide(objA, objB)
+
+                if collision:
+                    manifold = self._handle_collision(objA, objB, normal, depth)
+                    if manifold is not None:
+                        manifolds.append(manifold)
+        if self.collision_handlers:
+            # A handler may have removed a body of a pair handled before it
+            manifolds = [manifold for manifold in manifolds
+                         if manifold.objA in order and manifold.objB in order]
+
+        profiler = self.profiler
+        if profiler is None:
+            self._solve_contacts(manifolds)
+        else:
+            start = time.perf_counter()
+            self._solve_contacts(manifolds)
+            profiler.phase("contact_solver", start, time.perf_counter())
 
-            if collision:
-                self._handle_collision(objA, objB, normal, depth)
+    def _narrow_phase_batched(self, pairs):
+        """Test the circle and polygon pairs in vectorized passes, other pairs one by one.
+
+        Every pair is tested against the positions at the start of the narrow phase, then the
+        collisions are handled in pair order. Returns the manifolds of the handled collisions."""
+        results = {}
+
+        circle_pairs = []
+        polygon_pairs = []
+        circle_polygon_pairs = []  # Stored as (circle, polygon, pair)
+        other_pairs = set()
+        for pair in pairs:
+            objA, objB = pair
+            if isinstance(objA, CircleRigidBody):
+                if isinstance(objB, CircleRigidBody):
+                    circle_pairs.append(pair)
+                elif isinstance(objB, PolygonRigidBody):
+                    circle_polygon_pairs.append((objA, objB, pair))
+                else:
+                    other_pairs.add(pair)
+            elif isinstance(objA, PolygonRigidBody):
+                if isinstance(objB, PolygonRigidBody):
+                    polygon_pairs.append(pair)
+                elif isinstance(objB, CircleRigidBody):
+                    circle_polygon_pairs.append((objB, objA, pair))
+                else:
+                    other_pairs.add(pair)
+            else:
+                other_pairs.add(pair)
+
+        if circle_pairs:
+            index_a = np.array([objA._index for objA, _ in circle_pairs], dtype=np.intp)
+            index_b = np.array([objB._index for _, objB in circle_pairs], dtype=np.intp)
+            radius_a = np.array([objA.radius for objA, _ in circle_pairs], dtype=float)
+            radius_b = np.array([objB.radius for _, objB in circle_pairs], dtype=float)
+            collision, normal, depth = BatchCollisionManager.intersect_circles(
+                self._storage.position, index_a, index_b, radius_a, radius_b)
+            self._collect_results(results, circle_pairs, collision, normal, depth)
+
+        if polygon_pairs or circle_polygon_pairs:
+            polygons = {}
+            for objA, objB in polygon_pairs:
+                polygons.setdefault(objA, len(polygons))
+                polygons.setdefault(objB, len(polygons))
+            for _, polygon, _ in circle_polygon_pairs:
+                polygons.setdefault(polygon, len(polygons))
+
+            vertices, counts = BatchCollisionManager.pack_polygons([polygon.vertices for polygon in polygons])
+            normals, _ = BatchCollisionManager.pack_polygons([polygon.normals for polygon in polygons])
+            centers = self._storage.position[[polygon._index for polygon in polygons]]
+
+            if polygon_pairs:
+                index_a = np.array([polygons[objA] for objA, _ in polygon_pairs], dtype=np.intp)
+                index_b = np.array([polygons[objB] for _, objB in polygon_pairs], dtype=np.intp)
+                collision, normal, depth = BatchCollisionManager.intersect_polygons(
+                    vertices, counts, centers, index_a, index_b, normals)
+                self._collect_results(results, polygon_pairs, collision, normal, depth)
+
+            if circle_polygon_pairs:
+                circle_center = self._storage.position[[circle._index for circle, _, _ in circle_polygon_pairs]]
+                circle_radius = np.array([circle.radius for circle, _, _ in circle_polygon_pairs], dtype=float)
+                polygon_index = np.array([polygons[polygon] for _, polygon, _ in circle_polygon_pairs], dtype=np.intp)
+                collision, normal, depth = BatchCollisionManager.intersect_circle_polygon(
+                    circle_center, circle_radius, vertices, counts, centers, polygon_index, normals)
+
+                # The normal points from the circle to the polygon, flip it when the polygon is objA.
+                flip = np.array([pair[0] is not circle for circle, _, pair in circle_polygon_pairs])
+                normal[flip] = -normal[flip]
+                self._collect_results(results, [pair for _, _, pair in circle_polygon_pairs],
+                                      collision, normal, depth)
+
+        manifolds = []
+        for pair in pairs:
+            if pair in results:
+                normal, depth = results[pair]
+            elif pair in other_pairs:
+                collision, normal, depth = CollisionManager.is_collide(*pair)
+                if not collision:
+                    continue
+            else:
+                continue
+            manifold = self._handle_collision(pair[0], pair[1], normal, depth)
+            if manifold is not None:
+                manifolds.append(manifold)
+        return manifolds
+
+    @staticmethod
+    def _collect_results(results, pairs, collision, normal, depth):
+        for i in np.flatnonzero(collision).tolist():
+            results[pairs[i]] = (Vector2(*normal[i].tolist()), depth.item(i))
 
     def _handle_collision(self, objA, objB, normal, depth):
-        """Handle a detected collision."""
+        """Handle a detected collision: separate the objects and return the updated manifold of
+        the pair, or None if the begin handler rejected the collision or a body of the pair was
+        removed by the handler of an earlier pair."""
+        if objA not in self._order or objB not in self._order:
+            return
+
         handler_key = (type(objA), type(objB))
         handler = self.collision_handlers.get(handler_key)
 
         if handler and "begin" in handler and handler["begin"]:
-            if not handler["begin"](objA, objB, normal, depth):
+            if not self._call_handler(handler["begin"], objA, objB, normal, depth):
                 return
 
-        self._separate(objA, objB, normal * depth)
-        self._resolve_collision_basic(objA, objB, normal)
+        if objA.sleeping:
+            objA.wake()
+        if objB.sleeping:
+            objB.wake()
+
+        remaining_depth = self._separate(objA, objB, normal, depth)
+        manifold = self._update_manifold(objA, objB, normal, depth)
+        manifold.remaining_depth = remaining_depth
+        manifold.separated_positions = (objA.x, objA.y, objB.x, objB.y)
 
         if handler and "separate" in handler and handler["separate"]:
-            handler["separate"](objA, objB)
+            self._call_handler(handler["separate"], objA, objB)
+
+        return manifold
+
+    def _call_handler(self, handler, *args):
+        profiler = self.profiler
+        if profiler is None:
+            return handler(*args)
+
+        start = time.perf_counter()
+        result = handler(*args)
+        profiler.phase("collision_handlers", start, time.perf_counter())
+        profiler.count("handler_calls")
+        return result
+
+    def _update_manifold(self, objA, objB, normal, depth):
+        pair = (objA, objB)
+        manifold = self._previous_contacts.get(pair)
+        if manifold is None:
+            manifold = ContactManifold(objA, objB)
+
+        points = CollisionManager.find_contact_points(objA, objB, normal, self.contact_tolerance)
+        manifold.update(normal, depth, points, self.contact_match_distance)
+        self._contacts[pair] = manifold
+        return manifold
+
+    def _separate(self, objA, objB, normal, depth):
+        """Push colliding objects apart along the normal, in proportion to their inverse mass,
+        and return the penetration left.
+
+        Only position_correction of the penetration beyond penetration_slop is removed, so
+        resting contacts keep touching and stacks don't jitter."""
+        correction = (depth - self.penetration_slop) * self.position_correction
+        if correction <= 0:
+            return depth
+
+        inv_mass_a = 0.0 if objA.static else objA.inv_mass
+        inv_mass_b = 0.0 if objB.static else objB.inv_mass
+        inv_mass_sum = inv_mass_a + inv_mass_b
+        if inv_mass_sum == 0:
+            return depth
+
+        scale = correction / inv_mass_sum
+        if inv_mass_a:
+            objA.position.add_scaled(normal, -scale * inv_mass_a)
+        if inv_mass_b:
+            objB.position.add_scaled(normal, scale * inv_mass_b)
+        return depth - correction
+
+    def _correct_positions(self, manifolds):
+        """Separate the colliding pairs again position_iterations times.
+
+        Separating a pair pushes its bodies into their other neighbours, one pass leaves the
+        bottom of a stack sinking under the weight above it. The penetration is estimated from
+        the translation of the bodies since the pair was separated, without testing it again."""
+        for _ in range(self.position_iterations):
+            for manifold in manifolds:
+                objA = manifold.objA
+                objB = manifold.objB
+                a_x, a_y, b_x, b_y = manifold.separated_positions
+                normal = manifold.normal
+                moved = (((objB.x - b_x) - (objA.x - a_x)) * normal.x +
+                         ((objB.y - b_y) - (objA.y - a_y)) * normal.y)
+                self._separate(objA, objB, normal, manifold.remaining_depth - moved)
+
+    def _solve_contacts(self, manifolds):
+        """Sequential impulse contact solver with friction and rotation.
+
+        The data that only depends on the positions is computed once, the impulses of the
+        previous step are applied again when warm_starting is on, then every contact is solved
+        velocity_iterations times: friction first, bounded by the normal impulse, then the
+        normal impulse, whose accumulated value never pulls the bodies together. The positions
+        are corrected last, see _correct_positions."""
+        if not manifolds:
+            return
+
+        for manifold in manifolds:
+            self._prepare_manifold(manifold)
+        for _ in range(self.velocity_iterations):
+            for manifold in manifolds:
+                self._solve_manifold(manifold)
+        self._correct_positions(manifolds)
 
     @staticmethod
-    def _separate(objA, objB, normal_dot_depth):
-        """Separate colliding objects based on the normal vector."""
-        if objB.static:
-            objA.position += -normal_dot_depth
-        elif objA.static:
-            objB.position += normal_dot_depth
+    def _inverse_mass(obj):
+        """Inverse mass and inertia as seen by the solver, static bodies never move."""
+        if obj.static:
+            return 0.0, 0.0
+        inertia = obj.inertia
+        return obj.inv_mass, 1 / inertia if inertia > 0 else 0.0
+
+    def _prepare_manifold(self, manifold):
+        objA = manifold.objA
+        objB = manifold.objB
+        inv_mass_a, inv_inertia_a = self._inverse_mass(objA)
+        inv_mass_b, inv_inertia_b = self._inverse_mass(objB)
+        manifold.inv_mass_a = inv_mass_a
+        manifold.inv_inertia_a = inv_inertia_a
+        manifold.inv_mass_b = inv_mass_b
+        manifold.inv_inertia_b = inv_inertia_b
+        manifold.friction = math.sqrt(objA.friction * objB.friction)
+        restitution = min(objA.restitution, objB.restitution)
+        restitution_threshold = self.restitution_threshold
+
+        normal_x = manifold.normal.x
+        normal_y = manifold.normal.y
+        # The arms are taken from the positions the contact points were found at: the pairs
+        # separated since then moved the bodies, and arms off the normal would add torque.
+        position_a_x, position_a_y, position_b_x, position_b_y = manifold.separated_positions
+        # The normal force on a circle goes through its center. The batched narrow phase finds
+        # the normal before the earlier pairs are separated, so it is only nearly aligned with
+        # the contact point: keep the part of the arm along the normal.
+        circle_a = isinstance(objA, CircleRigidBody)
+        circle_b = isinstance(objB, CircleRigidBody)
+        velocity_a = objA.velocity
+        velocity_b = objB.velocity
+        angular_velocity_a = objA.angular_velocity
+        angular_velocity_b = objB.angular_velocity
+
+        for contact in manifold.contacts:
+            r_a_x = contact.point.x - position_a_x
+            r_a_y = contact.point.y - position_a_y
+            r_b_x = contact.point.x - position_b_x
+            r_b_y = contact.point.y - position_b_y
+            if circle_a:
+                along = r_a_x * normal_x + r_a_y * normal_y
+                r_a_x, r_a_y = normal_x * along, normal_y * along
+            if circle_b:
+                along = r_b_x * normal_x + r_b_y * normal_y
+                r_b_x, r_b_y = normal_x * along, normal_y * along
+            contact.r_a_x, contact.r_a_y = r_a_x, r_a_y
+            contact.r_b_x, contact.r_b_y = r_b_x, r_b_y
+
+            # The tangent is (-normal_y, normal_x), so r x tangent = r . normal
+            rn_a = r_a_x * normal_y - r_a_y * normal_x
+            rn_b = r_b_x * normal_y - r_b_y * normal_x
+            rt_a = r_a_x * normal_x + r_a_y * normal_y
+            rt_b = r_b_x * normal_x + r_b_y * normal_y
+            normal_mass = (inv_mass_a + inv_mass_b +
+                           inv_inertia_a * rn_a * rn_a + inv_inertia_b * rn_b * rn_b)
+            tangent_mass = (inv_mass_a + inv_mass_b +
+                            inv_inertia_a * rt_a * rt_a + inv_inertia_b * rt_b * rt_b)
+            contact.normal_mass = 1 / normal_mass if normal_mass > 0 else 0.0
+            contact.tangent_mass = 1 / tangent_mass if tangent_mass > 0 else 0.0
+
+            relative_x = (velocity_b.x - angular_velocity_b * r_b_y) - (velocity_a.x - angular_velocity_a * r_a_y)
+            relative_y = (velocity_b.y + angular_velocity_b * r_b_x) - (velocity_a.y + angular_velocity_a * r_a_x)
+            velocity_along_normal = relative_x * normal_x + relative_y * normal_y
+            if velocity_along_normal < -restitution_threshold:
+                contact.velocity_bias = -restitution * velocity_along_normal
+            else:
+                contact.velocity_bias = 0.0
+
+        if self.warm_starting:
+            for contact in manifold.contacts:
+                normal_impulse = contact.normal_impulse
+                tangent_impulse = contact.tangent_impulse
+                self._apply_contact_impulse(manifold, contact,
+                                            normal_x * normal_impulse - normal_y * tangent_impulse,
+                                            normal_y * normal_impulse + normal_x * tangent_impulse)
         else:
-            objA.position += -normal_dot_depth / 2
-            objB.position += normal_dot_depth / 2
+            for contact in manifold.contacts:
+                contact.normal_impulse = 0.0
+                contact.tangent_impulse = 0.0
 
     @staticmethod
-    def _resolve_collision_basic(objA, objB, normal):
-        """Resolve the collision by applying impulses to the objects."""
-        relative_velocity = objB.velocity - objA.velocity
+    def _apply_contact_impulse(manifold, contact, impulse_x, impulse_y):
+        """Apply the impulse at the contact point, -impulse to objA and +impulse to objB."""
+        inv_mass_a = manifold.inv_mass_a
+        if inv_mass_a:
+            objA = manifold.objA
+            velocity = objA.velocity
+            velocity.set(velocity.x - impulse_x * inv_mass_a, velocity.y - impulse_y * inv_mass_a)
+            objA.angular_velocity -= manifold.inv_inertia_a * (contact.r_a_x * impulse_y - contact.r_a_y * impulse_x)
 
-        if relative_velocity.dot(normal) > 0.0:
-            return
+        inv_mass_b = manifold.inv_mass_b
+        if inv_mass_b:
+            objB = manifold.objB
+            velocity = objB.velocity
+            velocity.set(velocity.x + impulse_x * inv_mass_b, velocity.y + impulse_y * inv_mass_b)
+            objB.angular_velocity += manifold.inv_inertia_b * (contact.r_b_x * impulse_y - contact.r_b_y * impulse_x)
 
-        e = min(objA.restitution, objB.restitution)
-        j = - (1.0 + e) * relative_velocity.dot(normal)
-        j = j / (objA.inv_mass + objB.inv_mass)
+    def _solve_manifold(self, manifold):
+        objA = manifold.objA
+        objB = manifold.objB
+        normal_x = manifold.normal.x
+        normal_y = manifold.normal.y
+        tangent_x = -normal_y
+        tangent_y = normal_x
+        friction = manifold.friction
+        velocity_a = objA.velocity
+        velocity_b = objB.velocity
 
-        impulse = j * normal
+        for contact in manifold.contacts:
+            r_a_x, r_a_y = contact.r_a_x, contact.r_a_y
+            r_b_x, r_b_y = contact.r_b_x, contact.r_b_y
 
-        objA.velocity -= impulse * objA.inv_mass
-        objB.velocity += impulse * objB.inv_mass
+            if friction:
+                angular_velocity_a = objA.angular_velocity
+                angular_velocity_b = objB.angular_velocity
+                relative_x = (velocity_b.x - angular_velocity_b * r_b_y) - (velocity_a.x - angular_velocity_a * r_a_y)
+                relative_y = (velocity_b.y + angular_velocity_b * r_b_x) - (velocity_a.y + angular_velocity_a * r_a_x)
+                velocity_along_tangent = relative_x * tangent_x + relative_y * tangent_y
 
-    @staticmethod
-    def _resolve_collision_with_rotation(objA, objB, normal):
-        pass
\ No newline at end of file
+                max_friction = friction * contact.normal_impulse
+                old_impulse = contact.tangent_impulse
+                impulse = old_impulse - velocity_along_tangent * contact.tangent_mass
+                impulse = max(-max_friction, min(impulse, max_friction))
+                contact.tangent_impulse = impulse
+
+                impulse -= old_impulse
+                self._apply_contact_impulse(manifold, contact, tangent_x * impulse, tangent_y * impulse)
+
+            angular_velocity_a = objA.angular_velocity
+            angular_velocity_b = objB.angular_velocity
+            relative_x = (velocity_b.x - angular_velocity_b * r_b_y) - (velocity_a.x - angular_velocity_a * r_a_y)
+            relative_y = (velocity_b.y + angular_velocity_b * r_b_x) - (velocity_a.y + angular_velocity_a * r_a_x)
+            velocity_along_normal = relative_x * normal_x + relative_y * normal_y
+
+            old_impulse = contact.normal_impulse
+            impulse = max(old_impulse + (contact.velocity_bias - velocity_along_normal) * contact.normal_mass, 0.0)
+            contact.normal_impulse = impulse
+
+            impulse -= old_impulse
+            self._apply_contact_impulse(manifold, contact, normal_x * impulse, normal_y * impulse)
@@ -0,0 +1,102 @@
+"""Sweep the stiffness and damping of the breakable soft body scene with a BatchRunner and
+compare it with running the worlds one after the other in this process.
+
+Run from the repository root with: python -m benchmarks.batch_runner
+"""
+import itertools
+import math
+import os
+import time
+
+import numpy as np
+
+from MatterPy.batch_runner import BatchRunner
+from MatterPy.constraint import SpringConstraint
+from MatterPy.particle import Particle
+from MatterPy.rigid_body import BoxRigidBody, CircleRigidBody
+from MatterPy.vector2 import Vector2
+from MatterPy.world import World
+
+WIDTH, HEIGHT = 1920, 1080
+STEPS = 600
+STIFFNESSES = (1000, 2000, 4000)
+DAMPINGS = (0.5, 1, 2)
+
+
+def create_breakable_soft_body(stiffness, damping, max_force=5000, size=7, spacing=32):
+    """The scene of exemples/softbody-breakable.py, without the renderer."""
+    world = World(gravity=Vector2(0, 9.81 * 5), batched=True)
+    world.add(BoxRigidBody(WIDTH // 2, HEIGHT - 32, WIDTH, 32, static=True),
+              BoxRigidBody(WIDTH // 2 + 200, HEIGHT // 2 - 200, WIDTH / 6, 32, static=True, angle=-math.pi / 6),
+              BoxRigidBody(WIDTH // 2 - 200, HEIGHT // 2, WIDTH / 6, 32, static=True, angle=math.pi / 6),
+              BoxRigidBody(WIDTH // 2 + 200, HEIGHT // 2 + 200, WIDTH / 6, 32, static=True, angle=-math.pi / 6),
+              BoxRigidBody(WIDTH // 2 - 200, HEIGHT // 2 + 400, WIDTH / 6, 32, static=True, angle=math.pi / 6))
+
+    x, y = WIDTH // 2 + 192, 128
+    bodies = []
+    for r in range(size):
+        row = []
+        for c in range(size):
+            body_x = x + (size / 2 - (c + 0.5)) * spacing
+            body_y = y + (size / 2 - (r + 0.5)) * spacing
+            if r in (0, size - 1) or c in (0, size - 1):
+                body = CircleRigidBody(x=body_x, y=body_y, radius=spacing / 4)
+            else:
+                body = Particle(x=body_x, y=body_y, mass=1)
+            world.add(body)
+            row.append(body)
+        bodies.append(row)
+
+    for r in range(size):
+        for c in range(size):
+            neighbours = []
+            if c < size - 1:
+                neighbours.append((bodies[r][c + 1], spacing))
+            if r < size - 1:
+                neighbours.append((bodies[r + 1][c], spacing))
+                if c < size - 1:
+                    neighbours.append((bodies[r + 1][c + 1], spacing * math.sqrt(2)))
+                if c > 0:
+                    neighbours.append((bodies[r + 1][c - 1], spacing * math.sqrt(2)))
+            for other, length in neighbours:
+                world.add(SpringConstraint(bodies[r][c], other, length=length, stiffness=stiffness,
+                                           damping=damping, max_force=max_force))
+    return world
+
+
+def spring_count(world):
+    return float(len(world.constraints))
+
+
+def mean_height(world):
+    storage = world.storage
+    return float(storage.position[:storage.count, 1][~storage.static[:storage.count]].mean())
+
+
+def main():
+    parameter_sets = [dict(stiffness=stiffness, damping=damping)
+                      for stiffness, damping in itertools.product(STIFFNESSES, DAMPINGS)]
+
+    start = time.perf_counter()
+    for parameters in parameter_sets:
+        create_breakable_soft_body(**parameters).advance(STEPS)
+    serial = time.perf_counter() - start
+
+    runner = BatchRunner(create_breakable_soft_body, STEPS, record_every=60,
+                         metrics=dict(springs=spring_count, height=mean_height))
+    start = time.perf_counter()
+    with runner.run(parameter_sets) as result:
+        pooled = time.perf_counter() - start
+        springs = result.metric("springs")[:, -1].copy()
+        heights = result.metric("height")[:, -1].copy()
+        assert not np.isnan(result.positions[:, :, :result.body_counts.min()]).any()
+
+    print(f"{len(parameter_sets)} worlds, {STEPS} steps, {os.cpu_count()} CPUs")
+    print(f"serial {serial:.2f} s, batch runner {pooled:.2f} s ({serial / pooled:.2f}x)")
+    print(f"{'stiffness':>10} {'damping':>8} {'springs':>8} {'height':>8}")
+    for parameters, count, height in zip(parameter_sets, springs, heights):
+        print(f"{parameters['stiffness']:>10} {parameters['damping']:>8} {count:>8.0f} {height:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Compare contact solver settings on a settled BoxComposite tower.
+
+Stability is the mean body speed over the last half of the run and the largest distance
+a box moved from its starting position, speed is simulated seconds per wall clock second.
+The World defaults are 8 velocity and 3 position iterations at 1/120. The old resolver rows
+run the tower on the MatterPy package of a baseline commit, the first commit by default,
+extracted with git archive and run in a new interpreter.
+
+Run from the repository root with: python -m benchmarks.contact_solver [--baseline REF]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from MatterPy.composite import BoxComposite
+from MatterPy.rigid_body import BoxRigidBody
+from MatterPy.vector2 import Vector2
+from MatterPy.world import World
+
+from .vector2 import ROOT, extract_baseline, first_commit
+
+SECONDS = 4
+SETTINGS = (
+    ("single pass", 1 / 120, dict(velocity_iterations=1, warm_starting=False, position_iterations=0)),
+    ("single pass", 1 / 60, dict(velocity_iterations=1, warm_starting=False, position_iterations=0)),
+    ("8 iterations", 1 / 120, dict(velocity_iterations=8, warm_starting=True, position_iterations=0)),
+    ("8 iterations", 1 / 60, dict(velocity_iterations=8, warm_starting=True, position_iterations=0)),
+    ("8 + 3 position", 1 / 120, dict(velocity_iterations=8, warm_starting=True, position_iterations=3)),
+    ("8 + 3 position", 1 / 60, dict(velocity_iterations=8, warm_starting=True, position_iterations=3)),
+    ("16 + 3 position", 1 / 60, dict(velocity_iterations=16, warm_starting=True, position_iterations=3)),
+)
+
+
+def create_tower(time_step, columns=3, rows=10, size=40):
+    world = World(gravity=Vector2(0, 981))
+    world.time_step = time_step
+    world.add(BoxRigidBody(960, 1000, 1600, size, restitution=0, friction=0.5, static=True))
+
+    tower = BoxComposite(960, 980 - rows * size / 2, columns, rows, size, mass=columns * rows)
+    for box in tower.objects:
+        box.restitution = 0
+        box.friction = 0.5
+    world.add(tower)
+    return world, tower.objects
+
+
+def advance(world):
+    """World.advance, or the phases of a substep on trees older than it."""
+    if hasattr(world, "advance"):
+        world.advance()
+    else:
+        world._step_objects()
+        world._broad_phase()
+        world._narrow_phase()
+
+
+def run(time_step, settings):
+    world, boxes = create_tower(time_step)
+    for name, value in settings.items():
+        setattr(world, name, value)
+
+    start = [(box.x, box.y) for box in boxes]
+    steps = round(SECONDS / time_step)
+    speeds = []
+
+    start_time = time.perf_counter()
+    for step in range(steps):
+        advance(world)
+        if step >= steps // 2:
+            speeds.append(sum(box.velocity.length() for box in boxes) / len(boxes))
+    elapsed = time.perf_counter() - start_time
+
+    drift = max(abs(box.x - x) + abs(box.y - y) for box, (x, y) in zip(boxes, start))
+    return SECONDS / elapsed, sum(speeds) / len(speeds), drift
+
+
+def run_baseline(tree, time_step):
+    """run with the default settings of the MatterPy package of tree, in a new interpreter."""
+    output = subprocess.run([sys.executable, "-m", "benchmarks.contact_solver", "--measure", str(time_step)],
+                            cwd=tree, env=dict(os.environ, PYTHONPATH=ROOT), capture_output=True, text=True,
+                            check=True)
+    return json.loads(output.stdout)
+
+
+def print_row(name, time_step, result):
+    speed, mean_speed, drift = result
+    print(f"{name:>15} {'1/' + str(round(1 / time_step)):>10} {speed:>10.2f} {mean_speed:>11.2f} {drift:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--baseline", help="commit of the old resolver, the first commit by default")
+    parser.add_argument("--measure", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.measure:
+        print(json.dumps(run(args.measure, {})))
+        return
+
+    baseline = args.baseline or first_commit()
+    print(f"Old resolver from {baseline[:12]}")
+    print(f"{'solver':>15} {'time step':>10} {'sim s / s':>10} {'mean speed':>11} {'max drift':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        extract_baseline(baseline, directory)
+        for time_step in (1 / 120, 1 / 60):
+            print_row("old resolver", time_step, run_baseline(directory, time_step))
+    for name, time_step, settings in SETTINGS:
+        print_row(name, time_step, run(time_step, settings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Compare the per-object and batched integrators.
+
+Run from the repository root with: python -m benchmarks.integrator
+"""
+import random
+import time
+
+import numpy as np
+
+from MatterPy.particle import Particle
+from MatterPy.vector2 import Vector2
+from MatterPy.world import World
+
+SIZES = (1_000, 10_000, 100_000)
+STEPS = 20
+
+
+def create_world(count, batched):
+    random.seed(0)
+    world = World(gravity=Vector2(0, 981), batched=batched)
+    for _ in range(count):
+        particle = Particle(random.uniform(0, 1000), random.uniform(0, 1000))
+        particle.velocity = Vector2(random.uniform(-50, 50), random.uniform(-50, 50))
+        world.add(particle)
+    return world
+
+
+def time_steps(world, steps):
+    start = time.perf_counter()
+    for _ in range(steps):
+        world._step_objects()
+    return (time.perf_counter() - start) / steps
+
+
+def main():
+    print(f"{'bodies':>8} {'per-object':>14} {'batched':>14} {'speedup':>9} {'max diff':>9}")
+    for count in SIZES:
+        steps = max(STEPS * 1_000 // count, 2)
+        per_object = create_world(count, batched=False)
+        batched = create_world(count, batched=True)
+
+        per_object_time = time_steps(per_object, steps)
+        batched_time = time_steps(batched, steps)
+
+        n = per_object.storage.count
+        diff = np.abs(per_object.storage.position[:n] - batched.storage.position[:n]).max()
+
+        print(f"{count:>8} {per_object_time * 1e3:>11.3f} ms {batched_time * 1e3:>11.3f} ms "
+              f"{per_object_time / batched_time:>8.1f}x {diff:>9.1e}")
+
+
+if __name__ == "__main__":
+    main()
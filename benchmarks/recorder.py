@@ -0,0 +1,54 @@
+"""Time a batched step with and without a TrajectoryRecorder, and the size of its frames.
+
+Run from the repository root with: python -m benchmarks.recorder
+"""
+import os
+import random
+import tempfile
+import time
+
+from MatterPy.particle import Particle
+from MatterPy.recorder import TrajectoryRecorder
+from MatterPy.vector2 import Vector2
+from MatterPy.world import World
+
+SIZES = (1_000, 20_000)
+STEPS = 50
+
+
+def create_world(count):
+    random.seed(0)
+    world = World(gravity=Vector2(0, 981), batched=True)
+    for _ in range(count):
+        particle = Particle(random.uniform(0, 1000), random.uniform(0, 1000))
+        particle.velocity = Vector2(random.uniform(-50, 50), random.uniform(-50, 50))
+        world.add(particle)
+    return world
+
+
+def time_steps(world, steps):
+    world.advance(1)  # Builds the batches
+    start = time.perf_counter()
+    world.advance(steps)
+    return (time.perf_counter() - start) / steps
+
+
+def main():
+    print(f"{'bodies':>8} {'step':>11} {'recorded':>11} {'overhead':>9} {'frame KB':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in SIZES:
+            plain = time_steps(create_world(count), STEPS)
+
+            world = create_world(count)
+            path = os.path.join(directory, f"{count}.traj")
+            with TrajectoryRecorder(path, world, capacity=STEPS + 1) as recorder:
+                world.recorder = recorder
+                recorded = time_steps(world, STEPS)
+                frame_size = recorder.frame_dtype(recorder.max_bodies).itemsize
+
+            print(f"{count:>8} {plain * 1e3:>8.3f} ms {recorded * 1e3:>8.3f} ms "
+                  f"{recorded / plain - 1:>8.0%} {frame_size / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""The scenes of exemples/ without pygame, for the benchmarks.
+
+Every factory takes a scale: 1 builds the scene of the example, larger scales add bodies
+the way the scene grows naturally (more fruits, wider soft bodies, more pendulums...), and
+widen the containers to fit them. Scenes are seeded, so a scale always gives the same world.
+"""
+import math
+import random
+
+from MatterPy.composite import BoxComposite, CircleComposite
+from MatterPy.constraint import SpringConstraint
+from MatterPy.particle import Particle
+from MatterPy.rigid_body import BoxRigidBody, CircleRigidBody
+from MatterPy.vector2 import Vector2
+from MatterPy.world import World
+
+GRAVITY = 9.81
+
+
+def add_soft_body(world, x, y, width, height, spacing, stiffness, damping, max_force=0, pinned=()):
+    """Grid of circles linked to their 8 neighbours by springs, as in the soft body examples.
+    pinned holds the (row, column) of the static circles."""
+    bodies = []
+    for r in range(height):
+        row = []
+        for c in range(width):
+            body = CircleRigidBody(x=x + (width / 2 - (c + 0.5)) * spacing,
+                                   y=y + (height / 2 - (r + 0.5)) * spacing,
+                                   radius=spacing / 4, static=(r, c) in pinned)
+            world.add(body)
+            row.append(body)
+        bodies.append(row)
+
+    diagonal = spacing * math.sqrt(2)
+    for r in range(height):
+        for c in range(width):
+            neighbours = []
+            if c < width - 1:
+                neighbours.append((bodies[r][c + 1], spacing))
+            if r < height - 1:
+                neighbours.append((bodies[r + 1][c], spacing))
+                if c < width - 1:
+                    neighbours.append((bodies[r + 1][c + 1], diagonal))
+                if c > 0:
+                    neighbours.append((bodies[r + 1][c - 1], diagonal))
+            for other, length in neighbours:
+                world.add(SpringConstraint(bodies[r][c], other, length=length, stiffness=stiffness,
+                                           damping=damping, max_force=max_force))
+    return bodies
+
+
+def add_container(world, width, height, thickness=24):
+    world.add(BoxRigidBody(width // 2, height - thickness, width - thickness, thickness, static=True),
+              BoxRigidBody(thickness, height // 2, thickness, height - thickness, static=True),
+              BoxRigidBody(width - thickness, height // 2, thickness, height - thickness, static=True))
+
+
+def create_suika(scale=1, seed=0):
+    """exemples/suika-game.py: fruits of the same size merge into a bigger one. The example
+    drops a fruit every half second, here 40 * scale fruits start stacked above the box."""
+    rng = random.Random(seed)
+    width, height = int(600 * math.sqrt(scale)), 1080
+    world = World(gravity=Vector2(0, GRAVITY * 100))
+    add_container(world, width, height)
+
+    merged = set()
+
+    def on_collision_begin(objA, objB, normal, depth):
+        if objA.radius != objB.radius:
+            return True
+        if objA not in merged and objB not in merged:
+            merged.update((objA, objB))
+            world.remove_later(objA, objB)
+            world.add(CircleRigidBody(objA.x, objA.y, objA.radius + 16))
+        return False
+
+    world.add_collision_handler(CircleRigidBody, CircleRigidBody, begin=on_collision_begin)
+
+    for index in range(40 * scale):
+        world.add(CircleRigidBody(rng.uniform(64, width - 64), -index * 24, rng.choice((16, 16, 32, 48))))
+    return world
+
+
+def create_softbody_collapse(scale=1):
+    """exemples/softbody-collapse.py: a heavy plank falls on a 12 x 6 soft body, scale widens
+    the soft body."""
+    columns = 12 * scale
+    width, height = columns * 32 + 76, 1080
+    world = World(gravity=Vector2(0, GRAVITY * 10))
+    world.add(BoxRigidBody(width // 2, height - 32, width, 32, static=True),
+              BoxRigidBody(width // 2, 128, width, 32, mass=200 * scale))
+    add_soft_body(world, width // 2, height - 320, columns, 6, spacing=32, stiffness=2000, damping=10,
+                  max_force=8000)
+    return world
+
+
+def create_rigidbody_composite(scale=1):
+    """exemples/rigidbody-composite.py: 5 x 5 grids of circles and boxes fall on slopes, scale
+    multiplies the number of columns and rows of the grids."""
+    width, height = 1920, 1080
+    size = round(5 * math.sqrt(scale))
+    world = World(gravity=Vector2(0, GRAVITY * 5))
+    world.add(BoxRigidBody(width // 2, height - 32, width, 32, static=True),
+              BoxRigidBody(width // 2 + 200, height // 2 - 200, width / 6, 32, static=True, angle=-math.pi / 6),
+              BoxRigidBody(width // 2 - 200, height // 2, width / 6, 32, static=True, angle=math.pi / 6),
+              BoxRigidBody(width // 2 + 200, height // 2 + 200, width / 6, 32, static=True, angle=-math.pi / 6),
+              BoxRigidBody(width // 2 - 200, height // 2 + 400, width / 6, 32, static=True, angle=math.pi / 6))
+    world.add(CircleComposite(width // 2 - 200, -size * 24, size, size, 48),
+              BoxComposite(width // 2 + 200, -size * 24, size, size, 48))
+    return world
+
+
+def create_double_pendulum(scale=1):
+    """exemples/double-pendulum.py: a chain of two springs, 8 * scale side by side."""
+    world = World(gravity=Vector2(0, GRAVITY * 200))
+    for index in range(8 * scale):
+        x = 500 + index * 50
+        particleA = Particle(x, 500, static=True)
+        particleB = Particle(x + 5, 300)
+        particleC = Particle(x, 100)
+        world.add(particleA, particleB, particleC,
+                  SpringConstraint(particleA, particleB, length=200, stiffness=5000, damping=8),
+                  SpringConstraint(particleB, particleC, length=200, stiffness=5000, damping=8))
+    return world
+
+
+def create_soft_ball(scale=1):
+    """exemples/soft-ball.py: a ball falls in a 15 x 7 soft body hanging from its top corners,
+    scale widens the soft body."""
+    columns = 15 * scale
+    width, height = columns * 32 - 20, 1080
+    world = World(gravity=Vector2(0, GRAVITY * 10))
+    world.add(BoxRigidBody(width // 2, height - 32, width, 32, static=True),
+              CircleRigidBody(width // 2, 128, 32, mass=64))
+    add_soft_body(world, width // 2, height - 152, columns, 7, spacing=32, stiffness=1024, damping=5,
+                  pinned=((0, 0), (0, columns - 1)))
+    return world
+
+
+SCENES = {
+    "suika": create_suika,
+    "softbody-collapse": create_softbody_collapse,
+    "rigidbody-composite": create_rigidbody_composite,
+    "double-pendulum": create_double_pendulum,
+    "soft-ball": create_soft_ball,
+}
@@ -0,0 +1,55 @@
+"""Time World.snapshot and World.restore, in place and into an empty world.
+
+With a third each of particles, circles and boxes, 100k bodies take about 20 ms to snapshot
+and 6 ms to restore in place, as both copy the storage arrays. Restoring into an empty world
+creates every body again and takes about 1.9 s.
+
+Run from the repository root with: python -m benchmarks.snapshot
+"""
+import random
+import time
+
+from MatterPy.particle import Particle
+from MatterPy.rigid_body import BoxRigidBody, CircleRigidBody
+from MatterPy.vector2 import Vector2
+from MatterPy.world import World
+
+SIZES = (1_000, 10_000, 100_000)
+
+
+def create_world(count):
+    random.seed(0)
+    world = World(gravity=Vector2(0, 981), batched=True)
+    for index in range(count):
+        x, y = random.uniform(0, 10_000), random.uniform(0, 10_000)
+        if index % 3 == 0:
+            body = Particle(x, y)
+        elif index % 3 == 1:
+            body = CircleRigidBody(x, y, 5)
+        else:
+            body = BoxRigidBody(x, y, 10, 10, angle=random.uniform(0, 3))
+        body.velocity = Vector2(random.uniform(-50, 50), random.uniform(-50, 50))
+        world.add(body)
+    return world
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    print(f"{'bodies':>8} {'size MB':>8} {'snapshot':>9} {'restore':>9} {'new world':>10}")
+    for count in SIZES:
+        world = create_world(count)
+        world.snapshot()  # Reads shapes and materials once
+        data, snapshot_time = timed(world.snapshot)
+        _, restore_time = timed(world.restore, data)
+        _, rebuild_time = timed(World(batched=True).restore, data)
+        print(f"{count:>8} {len(data) / 1e6:>8.2f} {snapshot_time * 1000:>7.1f}ms {restore_time * 1000:>7.1f}ms "
+              f"{rebuild_time * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Headless benchmark of the example scenes, with a baseline to catch regressions.
+
+Every scene of benchmarks.scenes is built at increasing scales and simulated for a fixed
+simulated duration, so runs of the same scene and scale do the same work:
+- steps/s comes from a run without profiler;
+- the mean time of every phase per substep and the counters from a run with a Profiler;
+- the peak memory from building the scene and a short run under tracemalloc.
+
+The results are written as JSON. Given a baseline written by an earlier run, a scene
+whose steps/s dropped, or whose broad phase, narrow phase, constraints or contact solver
+got slower, by more than the threshold is reported and the exit code is 1. When the
+counters differ from the baseline the workload changed, e.g. a fix in the narrow phase
+finds other contacts, and the timings are reported with a note.
+
+Run from the repository root with: python -m benchmarks.suite
+e.g. python -m benchmarks.suite --output new.json --baseline old.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from MatterPy.profiler import Profiler
+
+from .scenes import SCENES
+
+SCALES = (1, 2, 4)
+SECONDS = 2
+MEMORY_SECONDS = 0.25
+THRESHOLD = 0.15
+COMPARED_PHASES = ("broad_phase", "narrow_phase", "constraints", "contact_solver")
+MIN_PHASE_TIME = 0.05  # ms, faster phases are too noisy to compare
+
+
+def measure(create_scene, scale, seconds):
+    world = create_scene(scale)
+    bodies, constraints = world.storage.count, len(world.constraints)
+    start = time.perf_counter()
+    steps = world.run(seconds)
+    elapsed = time.perf_counter() - start
+
+    world = create_scene(scale)
+    world.profiler = Profiler()
+    world.run(seconds)
+    profiler = world.profiler
+
+    tracemalloc.start()
+    world = create_scene(scale)
+    world.run(MEMORY_SECONDS)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "bodies": bodies,
+        "constraints": constraints,
+        "steps": steps,
+        "steps_per_second": steps / elapsed,
+        "peak_memory_mb": peak / 1e6,
+        "phases_ms": {name: mean * 1000 for name, mean in profiler.mean_times().items()},
+        "counters": {name: total / max(profiler.substeps, 1) for name, total in profiler.counters.items()},
+    }
+
+
+def run_suite(scenes, scales, seconds):
+    results = {}
+    for name in scenes:
+        results[name] = {}
+        for scale in scales:
+            result = measure(SCENES[name], scale, seconds)
+            results[name][str(scale)] = result
+            phases = result["phases_ms"]
+            print(f"{name:>20} x{scale:<3} {result['bodies']:>6} {result['constraints']:>11} "
+                  f"{result['steps_per_second']:>9.1f} "
+                  + " ".join(f"{phases[phase]:>8.3f}" for phase in COMPARED_PHASES)
+                  + f" {result['peak_memory_mb']:>8.2f}")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return the regressions of results against baseline, as lines of text, and the notes
+    about scenes whose workload changed."""
+    regressions, notes = [], []
+    for name, scales in results.items():
+        for scale, result in scales.items():
+            old = baseline.get(name, {}).get(scale)
+            if old is None:
+                continue
+            label = f"{name} x{scale}"
+            changes = []
+            if result["steps_per_second"] < old["steps_per_second"] * (1 - threshold):
+                changes.append(f"steps/s {old['steps_per_second']:.1f} -> {result['steps_per_second']:.1f}")
+            for phase in COMPARED_PHASES:
+                new_time, old_time = result["phases_ms"][phase], old["phases_ms"].get(phase, 0.0)
+                if max(new_time, old_time) >= MIN_PHASE_TIME and new_time > old_time * (1 + threshold):
+                    changes.append(f"{phase} {old_time:.3f} -> {new_time:.3f} ms")
+
+            workload = [f"{counter} {old['counters'][counter]:.1f} -> {value:.1f}"
+                        for counter, value in result["counters"].items()
+                        if not _close(value, old["counters"].get(counter, 0.0), threshold)]
+            if workload:
+                notes.append(f"{label}: workload changed, {', '.join(workload)}")
+            if changes:
+                regressions.append(f"{label}: {', '.join(changes)}")
+    return regressions, notes
+
+
+def _close(a, b, tolerance):
+    return abs(a - b) <= tolerance * max(abs(a), abs(b), 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--scene", action="append", choices=sorted(SCENES),
+                        help="scene to run, can be repeated, all by default")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES)
+    parser.add_argument("--seconds", type=float, default=SECONDS, help="simulated seconds per run")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file written by an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="relative slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    print(f"{'scene':>20} {'scale':<4} {'bodies':>6} {'constraints':>11} {'steps/s':>9} "
+          + " ".join(f"{phase[:8]:>8}" for phase in COMPARED_PHASES) + f" {'peak MB':>8}")
+    results = run_suite(args.scene or list(SCENES), args.scales, args.seconds)
+    report = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "seconds": args.seconds, "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline is None:
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    if baseline["meta"]["seconds"] != args.seconds:
+        print(f"The baseline simulated {baseline['meta']['seconds']} s per run, not {args.seconds} s")
+        return 2
+
+    regressions, notes = compare(results, baseline["results"], args.threshold)
+    for note in notes:
+        print(note)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print(f"No regression above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""Nanoseconds and Vector2 allocations per operation, this tree against a baseline commit.
+
+The baseline MatterPy package is extracted with git archive, by default from the first commit
+of the repository, and every case runs in a new interpreter for each tree. The fused helpers
+don't exist in the baseline, they are compared with the allocating expressions they replace.
+
+Run from the repository root with: python -m benchmarks.vector2 [--baseline REF]
+"""
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BODIES = 5000
+
+SETUP = f"""
+from MatterPy.constraint import BoneConstraint, SpringConstraint
+from MatterPy.particle import Particle
+from MatterPy.vector2 import Vector2
+from MatterPy.world import World
+
+a = Vector2(1.5, -2.5)
+b = Vector2(0.25, 4.0)
+target = Vector2(0, 0)
+particle = Particle(0, 0)
+other = Particle(10, 0)
+spring = SpringConstraint(particle, other, length=5, stiffness=100, damping=1)
+bone = BoneConstraint(Particle(0, 0), Particle(10, 0), length=5)
+world = World(gravity=Vector2(0, 981))
+world.add(*[Particle(index % 100, index // 100) for index in range({BODIES})])
+"""
+
+# Cases run against both trees
+CASES = (
+    ("add", "a = a + b"),
+    ("add in place", "a += b"),
+    ("scale in place", "a *= -1.0"),
+    ("particle force += g * m", "particle.force += b * particle.mass"),
+    ("Particle.step", "particle.step(0.01)"),
+    ("SpringConstraint.step", "spring.step(0.01)"),
+    ("BoneConstraint.step", "bone.step(0.01)"),
+    (f"World._step_objects, {BODIES} particles", "world._step_objects()"),
+)
+
+# Allocating expression and the helper replacing it, in this tree only
+HELPERS = (
+    ("add scaled", "a = a + b * 0.5", "a.add_scaled(b, 0.5)"),
+    ("sub into target", "target = a - b", "a.sub_into(b, target)"),
+    ("normalize into target", "target = a.normalize()", "a.normalize_into(target)"),
+    ("particle force += g * m", "particle.force = particle.force + b * particle.mass",
+     "particle.force.add_scaled(b, particle.mass)"),
+)
+
+
+def count_allocations(statement, number=100):
+    """Number of Vector2 created per execution of statement."""
+    from MatterPy.vector2 import Vector2
+
+    created = 0
+    original_init = Vector2.__init__
+
+    def counting_init(self, x, y):
+        nonlocal created
+        created += 1
+        original_init(self, x, y)
+
+    namespace = {}
+    exec(SETUP, namespace)
+    Vector2.__init__ = counting_init
+    try:
+        exec(f"for _ in range({number}):\n    {statement}", namespace)
+    finally:
+        Vector2.__init__ = original_init
+    return created / number
+
+
+def time_statement(statement):
+    timer = timeit.Timer(statement, setup=SETUP)
+    number, _ = timer.autorange()
+    return min(timer.repeat(number=number, repeat=3)) / number * 1e9
+
+
+def measure_statements(statements):
+    return {statement: (time_statement(statement), count_allocations(statement)) for statement in statements}
+
+
+def measure(tree, statements):
+    """Run statements against the MatterPy package of tree, in a new interpreter."""
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--measure", *statements],
+                            env=dict(os.environ, PYTHONPATH=tree), capture_output=True, text=True, check=True)
+    return json.loads(output.stdout)
+
+
+def extract_baseline(ref, directory):
+    archive = subprocess.run(["git", "archive", ref, "MatterPy"], cwd=ROOT, capture_output=True, check=True)
+    with tarfile.open(fileobj=io.BytesIO(archive.stdout)) as tar:
+        tar.extractall(directory)
+
+
+def first_commit():
+    output = subprocess.run(["git", "rev-list", "--max-parents=0", "HEAD"], cwd=ROOT, capture_output=True,
+                            text=True, check=True)
+    return output.stdout.split()[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--baseline", help="commit to compare with, the first commit by default")
+    parser.add_argument("--measure", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.measure:
+        print(json.dumps(measure_statements(args.measure)))
+        return
+
+    baseline = args.baseline or first_commit()
+    statements = [statement for _, statement in CASES]
+    with tempfile.TemporaryDirectory() as directory:
+        extract_baseline(baseline, directory)
+        before = measure(directory, statements)
+    after = measure(ROOT, statements + [statement for case in HELPERS for statement in case[1:]])
+
+    print(f"Baseline {baseline[:12]} against this tree")
+    print(f"{'operation':<36} {'before ns':>10} {'allocs':>7} {'after ns':>10} {'allocs':>7} {'speedup':>8}")
+    for name, statement in CASES:
+        (before_time, before_allocations), (after_time, after_allocations) = before[statement], after[statement]
+        print(f"{name:<36} {before_time:>10.1f} {before_allocations:>7.1f} {after_time:>10.1f} "
+              f"{after_allocations:>7.1f} {before_time / after_time:>7.2f}x")
+
+    print()
+    print(f"{'helper, this tree':<36} {'expr ns':>10} {'allocs':>7} {'helper ns':>10} {'allocs':>7} {'speedup':>8}")
+    for name, expression, helper in HELPERS:
+        (expression_time, expression_allocations), (helper_time, helper_allocations) = after[expression], after[helper]
+        print(f"{name:<36} {expression_time:>10.1f} {expression_allocations:>7.1f} {helper_time:>10.1f} "
+              f"{helper_allocations:>7.1f} {expression_time / helper_time:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
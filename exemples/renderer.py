@@ -83,7 +83,7 @@ class Renderer:
     def render_rigid_bodies(self, rigid_bodies):
         for rigid_body in rigid_bodies:
             if rigid_body.AABB and self.show_AABBs:
-                pygame.draw.rect(self.window, (255, 255, 255), (rigid_body.AABB.min.x, rigid_body.AABB.min.y, rigid_body.AABB.max.x - rigid_body.AABB.min.x, rigid_body.AABB.max.y - rigid_body.AABB.min.y), width=1)
+                pygame.draw.rect(self.window, (255, 255, 255), (rigid_body.AABB.min_x, rigid_body.AABB.min_y, rigid_body.AABB.max_x - rigid_body.AABB.min_x, rigid_body.AABB.max_y - rigid_body.AABB.min_y), width=1)
             if rigid_body.static:
                 r, g, b = 24, 24, 24
             else:
@@ -0,0 +1,78 @@
+import os
+import sys
+
+import pygame
+
+from MatterPy.constraint import SpringConstraint
+from MatterPy.particle import Particle
+from MatterPy.recorder import TrajectoryReader, TrajectoryRecorder
+from MatterPy.vector2 import Vector2
+from MatterPy.world import World
+
+from renderer import Renderer
+
+WIDTH, HEIGHT = 1000, 1000
+PATH = sys.argv[1] if len(sys.argv) > 1 else "double-pendulum.traj"
+
+
+def record(path, seconds=120):
+    """Simulate the double pendulum without drawing it and record it to path."""
+    world = World(gravity=Vector2(0, 9.81 * 200))
+
+    particleA = Particle(WIDTH // 2, HEIGHT // 2, static=True)
+    particleB = Particle(WIDTH // 2 + 5, HEIGHT // 2 - 200)
+    particleC = Particle(WIDTH // 2, HEIGHT // 2 - 400)
+    world.add(particleA, particleB, particleC,
+              SpringConstraint(particleA, particleB, length=200, stiffness=5000, damping=8),
+              SpringConstraint(particleB, particleC, length=200, stiffness=5000, damping=8))
+
+    with TrajectoryRecorder(path, world, metadata={"scene": "double-pendulum"}) as recorder:
+        world.recorder = recorder
+        world.run(seconds)
+        world.recorder = None
+
+
+if not os.path.exists(PATH):
+    record(PATH)
+
+reader = TrajectoryReader(PATH)
+world = reader.create_world()
+renderer = Renderer(WIDTH, HEIGHT, window_name="replay")
+
+frames_per_second = round(1 / reader.time_step)
+index = 0
+playing = True
+
+running = True
+while running:
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            running = False
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE:
+                playing = not playing
+            elif event.key == pygame.K_LEFT:
+                index -= frames_per_second
+            elif event.key == pygame.K_RIGHT:
+                index += frames_per_second
+            elif event.key == pygame.K_HOME:
+                index = 0
+            elif event.key == pygame.K_END:
+                index = len(reader) - 1
+
+    if playing:
+        index += frames_per_second // renderer.max_fps
+    index = min(max(index, 0), len(reader) - 1)
+    frame = reader.show(index, world)
+
+    renderer.add_line(f"Replay of {PATH}")
+    renderer.add_line(f"Time: {frame.time:.2f} s, frame {index + 1}/{len(reader)}")
+    renderer.add_line("Space: play/pause, Left/Right: -/+ 1 s, Home/End: first/last frame")
+    renderer.add_line("FPS: %CURRENT_FPS%/%MAX_FPS%")
+    renderer.clear()
+    renderer.render_objects(world)
+    renderer.render_menu()
+    renderer.update()
+
+reader.close()
+renderer.close()